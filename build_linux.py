@@ -7,14 +7,271 @@ Linux平台专用构建脚本
 """
 
 import os
+import re
 import sys
+import time
 import platform
-import subprocess
-import shutil
+import functools
 from pathlib import Path
-from datetime import datetime
 from typing import Optional, List, Tuple, Dict
 
+
+@functools.lru_cache(maxsize=None)
+def _import_app_info(project_root: str):
+    """按文件路径加载AppInfo类（同一会话内只加载一次，不修改sys.path）"""
+    import importlib.util
+
+    app_info_file = Path(project_root) / 'defaults' / 'app_info.py'
+    if not app_info_file.is_file():
+        raise ImportError(f"找不到 {app_info_file}")
+
+    spec = importlib.util.spec_from_file_location('_build_app_info', app_info_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.AppInfo
+
+
+# 分隔线
+_SEPARATOR = '=' * 60
+_SECTION_SEPARATOR = '=' * 50
+
+# 会话级缓存：key -> (值, 写入时间)
+_cache: Dict[str, Tuple[object, float]] = {}
+_CACHE_TTL = 300  # 秒
+
+
+def _cached(key: str, producer, ttl: float = _CACHE_TTL):
+    """带TTL的简单缓存，过期或未命中时调用producer重新计算"""
+    now = time.monotonic()
+    entry = _cache.get(key)
+    if entry is not None and now - entry[1] < ttl:
+        return entry[0]
+
+    value = producer()
+    _cache[key] = (value, now)
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_linux_distribution() -> str:
+    """检测Linux发行版"""
+    # Python 3.10+ 可直接解析os-release
+    try:
+        return platform.freedesktop_os_release()['ID'].lower()
+    except Exception:
+        pass
+
+    try:
+        # 检查/etc/os-release
+        with open('/etc/os-release', 'rb') as f:
+            data = f.read(4096)
+        match = re.search(rb'^ID=["\']?([^"\'\n]+)', data, re.MULTILINE)
+        if match:
+            return match.group(1).decode('utf-8', 'replace').strip().lower()
+    except OSError:
+        pass
+
+    # 检查其他发行版文件
+    distro_files = {
+        '/etc/debian_version': 'debian',
+        '/etc/redhat-release': 'centos',
+        '/etc/fedora-release': 'fedora',
+        '/etc/arch-release': 'arch',
+    }
+
+    for file, distro in distro_files.items():
+        if os.path.exists(file):
+            return distro
+
+    return 'unknown'
+
+
+@functools.lru_cache(maxsize=None)
+def _find_compiler(compilers: Tuple[str, ...]) -> Optional[str]:
+    """在PATH中查找第一个可用的编译器，返回其完整路径"""
+    import shutil
+
+    for compiler in compilers:
+        path = shutil.which(compiler)
+        if path:
+            return path
+    return None
+
+
+def _dir_size(root) -> int:
+    """统计目录下所有文件的总大小（复用DirEntry缓存的stat信息）"""
+    total = 0
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+# 构建输出关键字（一次扫描找出行内所有关键字）
+_BUILD_LINE_PATTERN = re.compile(
+    rb'(?P<progress>progress:)'
+    rb'|(?P<error>error:|failed:|fatal:)'
+    rb'|(?P<success>done|success|complete)'
+    rb'|(?P<upx>upx)'
+    rb'|(?P<packing>compressing|packed)',
+    re.IGNORECASE
+)
+
+
+# 各类构建输出行的显示前缀
+_BUILD_LINE_PREFIX = {
+    'progress': "  ",
+    'error': "  ❌ ",
+    'success': "  ✅ ",
+    'upx': "  📦 ",
+}
+
+# 管道读取块大小
+_PIPE_READ_SIZE = 64 * 1024
+
+# 构建输出的行尾：\n 或进度条原地刷新用的 \r
+_LINE_SEPARATOR = re.compile(rb'[\r\n]')
+
+
+def _classify_build_line(line: bytes) -> Optional[str]:
+    """对构建输出行分类，返回 progress/error/success/upx 或 None"""
+    found = {m.lastgroup for m in _BUILD_LINE_PATTERN.finditer(line)}
+    if not found:
+        return None
+
+    # 按原有优先级判定
+    if 'progress' in found:
+        return 'progress'
+    if 'error' in found:
+        return 'error'
+    if 'success' in found:
+        return 'success'
+    if 'upx' in found and 'packing' in found:
+        return 'upx'
+    return None
+
+
+# 主程序分析：一次扫描识别入口点和GUI框架
+_MAIN_FILE_PATTERN = re.compile(
+    rb'(?P<main_check>if __name__ == "__main__":)'
+    rb'|(?P<PySide6>PySide6)'
+    rb'|(?P<PyQt5>PyQt5)'
+    rb'|(?P<PyQt6>PyQt6)'
+    rb'|(?P<tkinter>tkinter)'
+)
+_MAIN_SCAN_CHUNK = 64 * 1024
+_MAIN_SCAN_OVERLAP = len('if __name__ == "__main__":') - 1
+
+# GUI框架检测优先级：(匹配组名, 显示名)
+_GUI_FRAMEWORKS = (
+    ('PySide6', 'PySide6'),
+    ('PyQt5', 'PyQt5'),
+    ('PyQt6', 'PyQt6'),
+    ('tkinter', 'Tkinter'),
+)
+
+
+# 清理旧构建时删除的目录名（另外匹配 *.dist）
+_CLEAN_DIR_NAMES = frozenset({'build', '.build'})
+# 清理时不进入的目录
+_CLEAN_SKIP_DIRS = frozenset({'.git', 'node_modules', '.venv', 'venv', '__pycache__'})
+
+
+# 启动脚本模板
+_LAUNCHER_TEMPLATE = '''#!/bin/bash
+echo ""
+echo "════════════════════════════════════════════════"
+echo "   {app_name} v{version}"
+echo "   Build Time: {build_time}"
+echo "   Platform: Linux {arch}"
+echo "════════════════════════════════════════════════"
+echo ""
+
+APP_DIR="$(cd "$(dirname "$0")" && pwd)"
+cd "$APP_DIR"
+
+echo "Starting {app_name}..."
+sleep 1
+
+if [ -f "{exe_name}" ]; then
+    chmod +x "{exe_name}"
+    "./{exe_name}"
+else
+    echo "ERROR: Cannot find {exe_name}"
+    echo ""
+    echo "Available files:"
+    ls -la
+    echo ""
+    read -p "Press Enter to exit..."
+    exit 1
+fi
+'''
+
+
+# GUI框架对应的Nuitka插件
+_GUI_PLUGINS = {
+    'PySide6': 'pyside6',
+    'PyQt5': 'pyqt5',
+    'PyQt6': 'pyqt6',
+    'Tkinter': 'tk-inter',
+}
+
+
+@functools.lru_cache(maxsize=4)
+def _build_argv(dist_dir: str, output_name: str, upx_binary: Optional[str],
+                gui_plugin: Optional[str], data_dirs: Tuple[Tuple[str, str], ...],
+                main_file: str) -> Tuple[str, ...]:
+    """生成Nuitka构建参数（相同输入直接复用）"""
+    cmd = [sys.executable, '-m', 'nuitka', '--standalone']
+
+    # 核心参数
+    cmd.extend([
+        '--follow-imports',
+        '--assume-yes-for-downloads',
+        '--remove-output',
+        '--show-progress',
+    ])
+
+    # Linux特定参数
+    cmd.extend([
+        '--enable-plugin=anti-bloat',
+    ])
+
+    # UPX配置（通过Nuitka插件）
+    if upx_binary:
+        cmd.extend([
+            '--plugin-enable=upx',
+            f'--upx-binary={upx_binary}',
+        ])
+
+    # GUI框架插件
+    if gui_plugin:
+        cmd.append(f'--enable-plugin={gui_plugin}')
+
+    # 包含数据目录
+    for full_path, data_dir in data_dirs:
+        cmd.append(f'--include-data-dir={full_path}={data_dir}')
+
+    cmd.extend([
+        f'--output-dir={dist_dir}',
+        f'--output-filename={output_name}',
+        main_file
+    ])
+
+    return tuple(cmd)
+
+
 class LinuxBuilder:
     def __init__(self):
         # 检查操作系统
@@ -32,52 +289,52 @@ class LinuxBuilder:
         self.dist_dir = self.project_root / "dist"
         self.build_logs_dir = self.dist_dir / "build_logs"
 
-        # 应用信息
-        self._load_app_info()
+        # 应用信息（启动横幅需要显示，直接加载）
+        self.app_name, self.version, self.author = self._load_app_info()
 
-        # UPX配置 - 默认不启用
-        self.upx_path = None
-        self.upx_available = False
+        # UPX配置 - 默认不启用（UPX检测在首次访问upx_path时进行）
         self.upx_enabled = False  # 默认禁用
-        self._detect_upx()
+        self._upx_version_line = None
 
         # 编译器状态缓存
         self._compiler_available = None
 
-        # 创建必要目录
-        self.build_logs_dir.mkdir(exist_ok=True, parents=True)
-
         # 显示初始化信息
-        print(f"\n{'='*60}")
+        print(f"\n{_SEPARATOR}")
         print(f"🔧 Linux专用构建工具")
         print(f"   应用：{self.app_name} v{self.version}")
         print(f"   平台：Linux {self.arch}")
-        print(f"   UPX：{'可用' if self.upx_available else '不可用'}")
-        print(f"{'='*60}")
+        print(f"{_SEPARATOR}")
+
+    @functools.cached_property
+    def upx_path(self) -> Optional[str]:
+        """可用的UPX路径，首次访问时检测"""
+        return self._detect_upx()
 
-    def _load_app_info(self):
+    @property
+    def upx_available(self) -> bool:
+        return self.upx_path is not None
+
+    def _load_app_info(self) -> Tuple[str, str, str]:
         """从app_info.py加载应用信息"""
         try:
-            sys.path.insert(0, str(self.project_root))
-            from defaults.app_info import AppInfo
-            self.app_name = getattr(AppInfo, 'NAME')
-            self.version = getattr(AppInfo, 'VERSION')
-            self.author = getattr(AppInfo, 'AUTHOR')
+            AppInfo = _import_app_info(str(self.project_root))
+            return (
+                getattr(AppInfo, 'NAME'),
+                getattr(AppInfo, 'VERSION'),
+                getattr(AppInfo, 'AUTHOR'),
+            )
 
         except ImportError:
             print("⚠️  未找到 defaults/app_info.py，使用默认值")
-            self.app_name = "BindInterfaceProxy"
-            self.version = "1.0.0"
-            self.author = "Takeshi"
 
         except Exception as e:
             print(f"⚠️  读取应用信息时出错: {e}")
-            self.app_name = "BindInterfaceProxy"
-            self.version = "1.0.0"
-            self.author = "Takeshi"
 
-    def _detect_upx(self):
-        """检测UPX压缩工具可用性"""
+        return "BindInterfaceProxy", "1.0.0", "Takeshi"
+
+    def _detect_upx(self) -> Optional[str]:
+        """检测UPX压缩工具可用性，返回可用的UPX路径"""
         # Linux下常见的UPX路径
         upx_paths = [
             "upx",  # 系统PATH
@@ -92,17 +349,21 @@ class LinuxBuilder:
 
         for upx_candidate in upx_paths:
             if self._verify_upx(upx_candidate):
-                self.upx_path = upx_candidate
-                self.upx_available = True
-                break
+                print(f"✅ UPX可用: {upx_candidate}")
+                return upx_candidate
 
-        if self.upx_available:
-            print(f"✅ UPX可用: {self.upx_path}")
-        else:
-            print("ℹ️  UPX不可用")
+        print("ℹ️  UPX不可用")
+        return None
 
     def _verify_upx(self, upx_path: str) -> bool:
-        """验证UPX可执行文件"""
+        """验证UPX可执行文件，成功时记录版本信息"""
+        import shutil
+        import subprocess
+
+        # 不存在的路径无需启动子进程
+        if shutil.which(upx_path) is None:
+            return False
+
         try:
             result = subprocess.run(
                 [upx_path, '--version'],
@@ -110,7 +371,11 @@ class LinuxBuilder:
                 text=True,
                 timeout=3
             )
-            return result.returncode == 0 and 'UPX' in result.stdout
+            if result.returncode == 0 and 'UPX' in result.stdout:
+                lines = result.stdout.strip().split('\n')
+                self._upx_version_line = lines[0] if lines else None
+                return True
+            return False
         except:
             return False
 
@@ -120,26 +385,52 @@ class LinuxBuilder:
             return self._compiler_available
 
         # Linux下检查gcc或clang
-        compilers_to_check = ['gcc', 'clang']
-
-        for compiler in compilers_to_check:
-            try:
-                result = subprocess.run(
-                    ['which', compiler],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    self._compiler_available = True
-                    print(f"✅ 找到编译器: {compiler}")
-                    return True
-            except:
-                continue
+        compiler_path = _find_compiler(('gcc', 'clang'))
+        if compiler_path:
+            self._compiler_available = True
+            print(f"✅ 找到编译器: {compiler_path}")
+            return True
 
         self._compiler_available = False
         return False
 
+    def _query_installed_packages(self, distro: str, packages: List[str]) -> Dict[str, bool]:
+        """一次性查询多个软件包的安装状态"""
+        import subprocess
+
+        if distro in ['ubuntu', 'debian']:
+            # 状态缩写第二位为 'i' 表示已安装（如 ii、hi），未知包仅在stderr提示
+            result = subprocess.run(
+                ['dpkg-query', '-W', '-f=${db:Status-Abbrev} ${Package}\n', *packages],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=5
+            )
+            installed = {pkg: False for pkg in packages}
+            for line in result.stdout.splitlines():
+                fields = line.split()
+                if len(fields) == 2 and fields[1] in installed:
+                    installed[fields[1]] = fields[0][1:2] == 'i'
+            return installed
+
+        if distro in ['centos', 'fedora', 'rhel']:
+            # rpm -q 支持一次查询多个包，未安装的包会单独输出一行提示
+            result = subprocess.run(
+                ['rpm', '-q', *packages],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=5
+            )
+            return {
+                pkg: f"package {pkg} is not installed" not in result.stdout
+                for pkg in packages
+            }
+
+        # 未知发行版，假设已安装
+        return {pkg: True for pkg in packages}
+
     def _check_system_dependencies(self) -> Dict:
         """检查系统依赖"""
         print("\n🔍 检查系统依赖...")
@@ -155,39 +446,27 @@ class LinuxBuilder:
         # 检测发行版
         distro = self._detect_distribution()
 
-        for pkg, description in dependencies.items():
-            try:
-                if distro in ['ubuntu', 'debian']:
-                    result = subprocess.run(
-                        ['dpkg', '-s', pkg],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    installed = result.returncode == 0
-                elif distro in ['centos', 'fedora', 'rhel']:
-                    result = subprocess.run(
-                        ['rpm', '-q', pkg],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    installed = result.returncode == 0
-                else:
-                    # 未知发行版，假设已安装
-                    installed = True
-
-                if installed:
-                    print(f"  ✓ {description}")
-                    results[pkg] = True
-                else:
-                    print(f"  ✗ {description}: 未安装")
-                    results[pkg] = False
-                    missing_deps.append(pkg)
+        try:
+            installed_map = _cached(
+                f"deps:{distro}",
+                lambda: self._query_installed_packages(distro, list(dependencies))
+            )
+            query_error = None
+        except Exception as e:
+            installed_map = {}
+            query_error = e
 
-            except Exception as e:
-                print(f"  ? {description}: 无法检查 ({e})")
+        for pkg, description in dependencies.items():
+            if query_error is not None:
+                print(f"  ? {description}: 无法检查 ({query_error})")
                 results[pkg] = None
+            elif installed_map.get(pkg):
+                print(f"  ✓ {description}")
+                results[pkg] = True
+            else:
+                print(f"  ✗ {description}: 未安装")
+                results[pkg] = False
+                missing_deps.append(pkg)
 
         if missing_deps:
             print(f"\n⚠️  缺少的依赖包:")
@@ -203,29 +482,7 @@ class LinuxBuilder:
 
     def _detect_distribution(self) -> str:
         """检测Linux发行版"""
-        try:
-            # 检查/etc/os-release
-            if os.path.exists('/etc/os-release'):
-                with open('/etc/os-release', 'r') as f:
-                    for line in f:
-                        if line.startswith('ID='):
-                            return line.strip().split('=')[1].strip('"').lower()
-        except:
-            pass
-
-        # 检查其他发行版文件
-        distro_files = {
-            '/etc/debian_version': 'debian',
-            '/etc/redhat-release': 'centos',
-            '/etc/fedora-release': 'fedora',
-            '/etc/arch-release': 'arch',
-        }
-
-        for file, distro in distro_files.items():
-            if os.path.exists(file):
-                return distro
-
-        return 'unknown'
+        return _detect_linux_distribution()
 
     def _prepare_build_environment(self) -> bool:
         """准备构建环境"""
@@ -266,22 +523,30 @@ class LinuxBuilder:
             return analysis
 
         try:
-            with open(main_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            found = set()
+            tail = b''
+            with open(main_file, 'rb') as f:
+                # 分块读取，块间保留少量重叠避免关键字被截断
+                while True:
+                    chunk = f.read(_MAIN_SCAN_CHUNK)
+                    if not chunk:
+                        break
+                    data = tail + chunk
+                    found.update(m.lastgroup for m in _MAIN_FILE_PATTERN.finditer(data))
+                    # 入口点和最高优先级的框架都已找到，无需继续读取
+                    if 'main_check' in found and 'PySide6' in found:
+                        break
+                    tail = data[-_MAIN_SCAN_OVERLAP:]
 
             # 检查入口点
-            if 'if __name__ == "__main__":' in content:
+            if 'main_check' in found:
                 analysis['has_main_check'] = True
 
             # 检测GUI框架
-            if 'PySide6' in content:
-                analysis['gui_framework'] = 'PySide6'
-            elif 'PyQt5' in content:
-                analysis['gui_framework'] = 'PyQt5'
-            elif 'PyQt6' in content:
-                analysis['gui_framework'] = 'PyQt6'
-            elif 'tkinter' in content:
-                analysis['gui_framework'] = 'Tkinter'
+            for framework, name in _GUI_FRAMEWORKS:
+                if framework in found:
+                    analysis['gui_framework'] = name
+                    break
 
         except Exception as e:
             print(f"⚠️  文件分析异常: {e}")
@@ -297,20 +562,9 @@ class LinuxBuilder:
         print(f"\n⚙️  UPX配置")
         print(f"   路径: {self.upx_path}")
 
-        # 显示版本信息
-        try:
-            result = subprocess.run(
-                [self.upx_path, '--version'],
-                capture_output=True,
-                text=True,
-                timeout=3
-            )
-            if result.stdout:
-                lines = result.stdout.strip().split('\n')
-                if lines:
-                    print(f"   版本: {lines[0]}")
-        except:
-            pass
+        # 显示版本信息（检测UPX时已记录）
+        if self._upx_version_line:
+            print(f"   版本: {self._upx_version_line}")
 
         print("\n💡 UPX压缩可减小文件体积，但可能增加启动时间")
         choice = input("是否启用UPX压缩? (y/n, 默认n): ").strip().lower()
@@ -326,6 +580,9 @@ class LinuxBuilder:
 
     def _copy_distribution_files(self, target_dir: Path):
         """复制分发文件到目标目录"""
+        import shutil
+        from concurrent.futures import ThreadPoolExecutor
+
         print("\n📄 复制分发文件...")
 
         # 需要复制的文件列表
@@ -338,20 +595,32 @@ class LinuxBuilder:
             # ('CHANGELOG.txt', '更新日志'),
         ]
 
-        copied_count = 0
-        for filename, description in distribution_files:
-            source_path = self.project_root / filename
-
-            if not source_path.exists():
-                continue  # 文件不存在，跳过
-
+        def copy_one(filename: str) -> Optional[Exception]:
+            # copyfile 在Linux上走 sendfile/copy_file_range 零拷贝路径，分发文件无需保留时间戳
             try:
-                target_path = target_dir / filename
-                shutil.copy2(source_path, target_path)
-                print(f"  ✓ {description}: {filename}")
-                copied_count += 1
+                shutil.copyfile(self.project_root / filename, target_dir / filename)
+                return None
             except Exception as e:
-                print(f"  ✗ {description}: 复制失败 - {e}")
+                return e
+
+        # 只复制存在的文件
+        pending = [
+            (filename, description)
+            for filename, description in distribution_files
+            if (self.project_root / filename).exists()
+        ]
+
+        copied_count = 0
+        if pending:
+            # 各文件相互独立，并发复制；结果按原顺序输出
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                errors = executor.map(copy_one, [filename for filename, _ in pending])
+                for (filename, description), error in zip(pending, errors):
+                    if error is None:
+                        print(f"  ✓ {description}: {filename}")
+                        copied_count += 1
+                    else:
+                        print(f"  ✗ {description}: 复制失败 - {error}")
 
         if copied_count > 0:
             print(f"✅ 已复制 {copied_count} 个分发文件")
@@ -362,64 +631,43 @@ class LinuxBuilder:
 
     def _create_build_command(self, main_file: Path, analysis: Dict) -> Tuple[List[str], str]:
         """创建构建命令"""
-        cmd = [sys.executable, '-m', 'nuitka', '--standalone']
-
-        # 核心参数
-        cmd.extend([
-            '--follow-imports',
-            '--assume-yes-for-downloads',
-            '--remove-output',
-            '--show-progress',
-        ])
-
-        # Linux特定参数
-        cmd.extend([
-            '--enable-plugin=anti-bloat',
-        ])
-
         # UPX配置（通过Nuitka插件）
+        upx_binary = None
         if self.upx_enabled and self.upx_available:
-            cmd.extend([
-                '--plugin-enable=upx',
-                f'--upx-binary={self.upx_path}',
-            ])
+            upx_binary = self.upx_path
             print(f"📦 UPX压缩已启用（Nuitka插件）")
 
-        # GUI框架插件
-        if analysis['gui_framework'] == 'PySide6':
-            cmd.append('--enable-plugin=pyside6')
-        elif analysis['gui_framework'] == 'PyQt5':
-            cmd.append('--enable-plugin=pyqt5')
-        elif analysis['gui_framework'] == 'PyQt6':
-            cmd.append('--enable-plugin=pyqt6')
-        elif analysis['gui_framework'] == 'Tkinter':
-            cmd.append('--enable-plugin=tk-inter')
-
-        # 包含数据目录
-        data_dirs = ['resources']
-        for data_dir in data_dirs:
-            full_path = self.project_root / data_dir
-            if full_path.exists():
-                cmd.append(f'--include-data-dir={full_path}={data_dir}')
+        # 包含数据目录（只保留存在的目录）
+        data_dirs = tuple(
+            (str(self.project_root / data_dir), data_dir)
+            for data_dir in ['resources']
+            if (self.project_root / data_dir).exists()
+        )
 
         # 输出设置
         output_name = self.app_name.lower().replace(' ', '-')
 
-        cmd.extend([
-            f'--output-dir={self.dist_dir}',
-            f'--output-filename={output_name}',
-            str(main_file)
-        ])
-
-        return cmd, output_name
+        cmd = _build_argv(
+            str(self.dist_dir),
+            output_name,
+            upx_binary,
+            _GUI_PLUGINS.get(analysis['gui_framework']),
+            data_dirs,
+            str(main_file),
+        )
+        return list(cmd), output_name
 
     def _execute_build(self, cmd: List[str], output_name: str) -> Optional[Path]:
         """执行构建命令"""
-        print(f"\n{'='*50}")
+        import subprocess
+        from datetime import datetime
+
+        print(f"\n{_SECTION_SEPARATOR}")
         print("开始构建")
-        print(f"{'='*50}")
+        print(f"{_SECTION_SEPARATOR}")
 
         # 创建日志文件
+        self.build_logs_dir.mkdir(exist_ok=True, parents=True)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         log_file = self.build_logs_dir / f"build_{timestamp}.log"
 
@@ -427,45 +675,74 @@ class LinuxBuilder:
         print(f"⏳ 构建开始: {start_time.strftime('%H:%M:%S')}")
 
         try:
-            with open(log_file, 'w', encoding='utf-8') as log_f:
-                log_f.write(f"构建命令: {' '.join(cmd)}\n")
-                log_f.write(f"开始时间: {start_time}\n\n")
+            with open(log_file, 'wb') as log_f:
+                log_f.write(f"构建命令: {' '.join(cmd)}\n".encode('utf-8'))
+                log_f.write(f"开始时间: {start_time}\n\n".encode('utf-8'))
 
+                # 二进制管道：日志原样写入，仅对需要显示的行解码
                 process = subprocess.Popen(
                     cmd,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace'
+                    bufsize=0
                 )
 
                 # 简化输出处理
-                last_progress = ""
-                for line in process.stdout:
-                    line = line.rstrip()
-                    log_f.write(line + '\n')
-
-                    # 只显示关键信息
-                    if 'progress:' in line.lower():
-                        # 只显示不同的进度信息
-                        if line != last_progress:
-                            print(f"  {line}")
+                last_progress = b""
+                out = sys.stdout.write
+                stdout_fd = process.stdout.fileno()
+                pending: List[bytes] = []
+                eof = False
+                while not eof:
+                    chunk = os.read(stdout_fd, _PIPE_READ_SIZE)
+                    if chunk:
+                        log_f.write(chunk)
+
+                        # 只扫描新读到的块：进度条用 \r 原地刷新，与 \n 一样视为行尾，读到即可显示；
+                        # 未结束的行片段暂存在列表中，遇到行尾时才拼接
+                        *lines, tail = _LINE_SEPARATOR.split(chunk)
+                        if lines:
+                            pending.append(lines[0])
+                            lines[0] = b"".join(pending)
+                            pending.clear()
+                        if tail:
+                            pending.append(tail)
+                    else:
+                        eof = True
+                        lines = [b"".join(pending)] if pending else []
+
+                    shown = False
+                    for line in lines:
+                        line = line.rstrip()
+                        if not line:
+                            continue
+
+                        # 只显示关键信息
+                        kind = _classify_build_line(line)
+                        if kind is None:
+                            continue
+                        if kind == 'progress':
+                            # 只显示不同的进度信息
+                            if line == last_progress:
+                                continue
                             last_progress = line
-                    elif any(keyword in line.lower() for keyword in ['error:', 'failed:', 'fatal:']):
-                        print(f"  ❌ {line}")
-                    elif any(keyword in line.lower() for keyword in ['done', 'success', 'complete']):
-                        print(f"  ✅ {line}")
-                    elif 'upx' in line.lower() and ('compressing' in line.lower() or 'packed' in line.lower()):
-                        print(f"  📦 {line}")
+
+                        out(f"{_BUILD_LINE_PREFIX[kind]}{line.decode('utf-8', 'replace')}\n")
+                        shown = True
+
+                    # 每读一块最多刷新一次标准输出，进度行即时可见
+                    if shown:
+                        sys.stdout.flush()
 
                 process.wait()
                 end_time = datetime.now()
                 elapsed = end_time - start_time
 
-                log_f.write(f"\n结束时间: {end_time}\n")
-                log_f.write(f"耗时: {elapsed.total_seconds():.1f}秒\n")
-                log_f.write(f"退出码: {process.returncode}\n")
+                log_f.write(
+                    f"\n结束时间: {end_time}\n"
+                    f"耗时: {elapsed.total_seconds():.1f}秒\n"
+                    f"退出码: {process.returncode}\n".encode('utf-8')
+                )
 
             print(f"⏱️  构建耗时: {elapsed.total_seconds():.1f}秒")
 
@@ -482,110 +759,60 @@ class LinuxBuilder:
 
     def _locate_output_file(self, output_name: str) -> Optional[Path]:
         """定位生成的输出文件"""
-        # 查找可执行文件
-        exe_path = self.dist_dir / f"main.dist" / output_name
-
-        if exe_path.exists():
-            # 计算整个main.dist文件夹的大小
-            folder_size = 0
-            for path in exe_path.parent.rglob('*'):
-                if path.is_file():
-                    folder_size += path.stat().st_size
-
-            size_mb = folder_size / 1024 / 1024
-
-            # 显示可执行文件大小
-            exe_size_mb = exe_path.stat().st_size / 1024 / 1024
-
-            print(f"📦 可执行文件: {exe_path}")
-            print(f"📊 文件大小: {exe_size_mb:.2f} MB")
-            print(f"📁 文件夹总大小: {size_mb:.2f} MB")
-
-            # ✅ 复制分发文件到输出目录
-            self._copy_distribution_files(exe_path.parent)
-
-            # 添加执行权限
-            try:
-                exe_path.chmod(0o755)
-                print("🔒 已添加执行权限")
-            except:
-                pass
-
-            return exe_path
-
-        # 备选查找
+        # 查找可执行文件：默认位置在前，其余为备选
         possible_paths = [
+            self.dist_dir / "main.dist" / output_name,
             self.dist_dir / f"{output_name}.dist" / output_name,
             self.dist_dir / output_name,
         ]
 
         for path in possible_paths:
             if path.exists():
-                # 计算文件夹大小
-                folder_size = 0
-                folder_path = path.parent
+                return self._report_and_finalize(path)
 
-                if folder_path.exists() and folder_path.is_dir():
-                    for item in folder_path.rglob('*'):
-                        if item.is_file():
-                            folder_size += item.stat().st_size
+        print("⚠️  未找到可执行文件")
+        return None
 
-                size_mb = folder_size / 1024 / 1024
-                exe_size_mb = path.stat().st_size / 1024 / 1024
+    def _report_and_finalize(self, exe_path: Path) -> Path:
+        """显示输出大小、复制分发文件并添加执行权限"""
+        # 计算整个输出文件夹的大小（只遍历一次）
+        folder_size = _dir_size(exe_path.parent)
+        size_mb = folder_size / 1024 / 1024
 
-                print(f"📦 可执行文件: {path}")
-                print(f"📊 文件大小: {exe_size_mb:.2f} MB")
-                print(f"📁 文件夹总大小: {size_mb:.2f} MB")
+        # 显示可执行文件大小
+        exe_size_mb = exe_path.stat().st_size / 1024 / 1024
 
-                # ✅ 复制分发文件到输出目录
-                self._copy_distribution_files(path.parent)
+        print(f"📦 可执行文件: {exe_path}")
+        print(f"📊 文件大小: {exe_size_mb:.2f} MB")
+        print(f"📁 文件夹总大小: {size_mb:.2f} MB")
 
-                # 添加执行权限
-                try:
-                    path.chmod(0o755)
-                except:
-                    pass
+        # ✅ 复制分发文件到输出目录
+        self._copy_distribution_files(exe_path.parent)
 
-                return path
+        # 添加执行权限
+        try:
+            exe_path.chmod(0o755)
+            print("🔒 已添加执行权限")
+        except:
+            pass
 
-        print("⚠️  未找到可执行文件")
-        return None
+        return exe_path
 
     def _create_launcher_script(self, exe_path: Path):
         """创建启动脚本"""
-        launcher_path = exe_path.parent / "run.sh"
+        from datetime import datetime
 
-        launcher_content = f'''#!/bin/bash
-echo ""
-echo "════════════════════════════════════════════════"
-echo "   {self.app_name} v{self.version}"
-echo "   Build Time: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-echo "   Platform: Linux {self.arch}"
-echo "════════════════════════════════════════════════"
-echo ""
+        launcher_path = exe_path.parent / "run.sh"
 
-APP_DIR="$(cd "$(dirname "$0")" && pwd)"
-cd "$APP_DIR"
+        launcher_content = _LAUNCHER_TEMPLATE.format_map({
+            'app_name': self.app_name,
+            'version': self.version,
+            'build_time': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'arch': self.arch,
+            'exe_name': exe_path.name,
+        }).encode('utf-8')
 
-echo "Starting {self.app_name}..."
-sleep 1
-
-if [ -f "{exe_path.name}" ]; then
-    chmod +x "{exe_path.name}"
-    "./{exe_path.name}"
-else
-    echo "ERROR: Cannot find {exe_path.name}"
-    echo ""
-    echo "Available files:"
-    ls -la
-    echo ""
-    read -p "Press Enter to exit..."
-    exit 1
-fi
-'''
-
-        with open(launcher_path, 'w', encoding='utf-8') as f:
-            f.write(launcher_content)
+        launcher_path.write_bytes(launcher_content)
 
         # 添加执行权限
         launcher_path.chmod(0o755)
@@ -594,19 +821,34 @@ fi
 
     def _clean_old_builds(self):
         """清理旧的构建文件"""
+        import shutil
+        import fnmatch
+        from concurrent.futures import ThreadPoolExecutor
+
         print("\n🧹 清理旧构建...")
 
-        patterns = ["build", ".build", "*.dist"]
-        cleaned = 0
+        # 一次遍历收集所有待删除目录，匹配到的目录不再向下遍历
+        targets = []
+        for dirpath, dirnames, _ in os.walk(self.project_root, topdown=True):
+            for name in list(dirnames):
+                # 跳过版本库、虚拟环境等大目录，不向下遍历
+                if name in _CLEAN_SKIP_DIRS:
+                    dirnames.remove(name)
+                    continue
+                full_path = os.path.join(dirpath, name)
+                if os.path.islink(full_path):
+                    continue
+                if name in _CLEAN_DIR_NAMES or fnmatch.fnmatch(name, '*.dist'):
+                    targets.append(full_path)
+                    dirnames.remove(name)
 
-        for pattern in patterns:
-            for path in self.project_root.rglob(pattern):
-                if path.is_dir():
-                    try:
-                        shutil.rmtree(path, ignore_errors=True)
-                        cleaned += 1
-                    except:
-                        pass
+        cleaned = 0
+        if targets:
+            # 目录删除以系统调用为主，多个目录可并行删除
+            workers = min(8, os.cpu_count() or 1, len(targets))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(lambda p: shutil.rmtree(p, ignore_errors=True), targets):
+                    cleaned += 1
 
         if cleaned > 0:
             print(f"✅ 清理完成，删除了 {cleaned} 个目录")
@@ -673,9 +915,11 @@ fi
 
     def diagnose(self):
         """系统诊断"""
-        print(f"\n{'='*60}")
+        import subprocess
+
+        print(f"\n{_SEPARATOR}")
         print("🔍 系统诊断")
-        print(f"{'='*60}")
+        print(f"{_SEPARATOR}")
 
         # Python信息
         print(f"\n📝 Python环境:")
@@ -770,7 +1014,7 @@ fi
                     if continue_choice == 'n':
                         print("👋 再见！")
                         break
-                    print("\n" + "="*60)
+                    print("\n" + _SEPARATOR)
 
             except KeyboardInterrupt:
                 print("\n\n🛑 用户中断")
@@ -7,28 +7,220 @@ macOS平台专用构建脚本
 """
 
 import os
+import re
 import sys
+import json
+import mmap
+import time
+import threading
+import plistlib
 import platform
+import functools
 import subprocess
 import shutil
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor, Future
+
+# 平台信息（进程内不会变化，导入时读取一次）
+_SYSTEM_NAME = platform.system()
+_SYSTEM = _SYSTEM_NAME.lower()
+_ARCH = platform.machine().lower()
+_PY_VERSION = platform.python_version()
+_PROJECT_ROOT = Path(__file__).resolve().parent
+
+# 构建输出关键字（不区分大小写）
+_BUILD_LINE_PATTERN = re.compile(
+    r'(?P<progress>progress:)'
+    r'|(?P<error>error:|failed:|fatal:)'
+    r'|(?P<success>done|success|complete)'
+    r'|(?P<upx>upx)'
+    r'|(?P<packing>compressing|packed)',
+    re.IGNORECASE
+)
+
+# 构建日志写入缓冲与管道读取块大小
+_LOG_BUFFER_SIZE = 64 * 1024
+_PIPE_READ_SIZE = 64 * 1024
+
+# 构建输出的行尾：\n 或进度条原地刷新用的 \r
+_LINE_SEPARATOR = re.compile(rb'[\r\n]')
+
+# 图标候选路径（相对项目根目录，按优先级排列）
+_ICON_CANDIDATES = (
+    os.path.join('resources', 'icons', 'app_icon.icns'),
+    os.path.join('resources', 'icons', 'app_icon.png'),
+    'app_icon.icns',
+)
+
+# 环境探测结果的持久化缓存
+_PROBE_CACHE_FILE = Path.home() / '.cache' / 'bindinterfaceproxy' / 'env.json'
+_PROBE_CACHE_TTL = 24 * 3600  # 秒
+_probe_cache_lock = threading.Lock()
+
+# 清理旧构建时不进入的目录
+_CLEAN_SKIP_DIRS = frozenset({'.git', '.venv', 'venv', 'node_modules', '__pycache__'})
+
+# 超过此大小的main.py使用mmap扫描
+_MMAP_THRESHOLD = 1_000_000
+
+# GUI框架检测优先级：(关键字, 显示名)
+_GUI_FRAMEWORKS = (
+    (b'PySide6', 'PySide6'),
+    (b'PyQt5', 'PyQt5'),
+    (b'PyQt6', 'PyQt6'),
+    (b'tkinter', 'Tkinter'),
+)
+
+
+def _scan_main_content(content, analysis: Dict):
+    """扫描主程序内容（bytes或mmap），填充入口点和GUI框架信息"""
+    # 检查入口点
+    if content.find(b'if __name__ == "__main__":') >= 0:
+        analysis['has_main_check'] = True
+
+    # 检测GUI框架，命中即停止
+    for keyword, name in _GUI_FRAMEWORKS:
+        if content.find(keyword) >= 0:
+            analysis['gui_framework'] = name
+            break
+
+
+# copyfile(3) 标志位（见 <copyfile.h>）
+_COPYFILE_ALL = 0x0F          # COPYFILE_METADATA | COPYFILE_DATA
+_COPYFILE_CLONE = 0x01000000  # 尽可能克隆，否则普通复制
+
+
+@functools.lru_cache(maxsize=1)
+def _load_libsystem():
+    """加载libSystem并声明clonefile/copyfile签名，不可用时返回None"""
+    try:
+        import ctypes
+        libsystem = ctypes.CDLL('/usr/lib/libSystem.dylib', use_errno=True)
+        # int clonefile(const char *src, const char *dst, uint32_t flags)
+        libsystem.clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        libsystem.clonefile.restype = ctypes.c_int
+        # int copyfile(const char *from, const char *to, copyfile_state_t state, copyfile_flags_t flags)
+        libsystem.copyfile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_uint32]
+        libsystem.copyfile.restype = ctypes.c_int
+        return libsystem
+    except (OSError, AttributeError):
+        return None
+
+
+def _clone_or_copy(src: Path, dst: Path):
+    """复制文件：依次尝试 clonefile(2)、copyfile(3)+COPYFILE_CLONE，最后回退到shutil.copy2"""
+    libsystem = _load_libsystem()
+    if libsystem is not None:
+        src_bytes, dst_bytes = os.fsencode(src), os.fsencode(dst)
+
+        # clonefile不会覆盖已存在的目标文件
+        if not dst.exists() and libsystem.clonefile(src_bytes, dst_bytes, 0) == 0:
+            return
+
+        # copyfile会自动在克隆与普通复制之间选择，并保留扩展属性等元数据
+        if libsystem.copyfile(src_bytes, dst_bytes, None, _COPYFILE_ALL | _COPYFILE_CLONE) == 0:
+            return
+
+    shutil.copy2(src, dst)
+
+
+def _read_probe_cache(key: str) -> Optional[str]:
+    """读取持久化的环境探测结果，不存在或已过期时返回None"""
+    try:
+        with open(_PROBE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            entry = json.load(f).get(key)
+        if entry and time.time() - entry['ts'] < _PROBE_CACHE_TTL:
+            return entry['value']
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _write_probe_cache(key: str, value: str):
+    """写入环境探测结果（原子替换缓存文件，失败时忽略）"""
+    with _probe_cache_lock:
+        try:
+            try:
+                with open(_PROBE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    data = {}
+            except (OSError, ValueError):
+                data = {}
+
+            data[key] = {'value': value, 'ts': time.time()}
+
+            _PROBE_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = _PROBE_CACHE_FILE.with_name(f"{_PROBE_CACHE_FILE.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, _PROBE_CACHE_FILE)
+        except OSError:
+            pass
+
+
+def _scan_app_bundle(app_path) -> Dict:
+    """一次遍历.app包，统计总大小、Contents下各项大小及MacOS目录中的可执行文件"""
+    info = {
+        'total': 0,         # 整个应用包的文件总大小
+        'dirs': {},         # Contents下各子目录 -> 目录内文件总大小
+        'files': {},        # Contents下的文件 -> 大小
+        'executables': [],  # Contents/MacOS下的可执行文件 (名称, 大小)
+    }
+
+    contents_dir = os.path.join(os.fspath(app_path), 'Contents')
+    macos_dir = os.path.join(contents_dir, 'MacOS')
+
+    # 栈元素：(目录路径, 所属的Contents子目录名)
+    stack = [(os.fspath(app_path), None)]
+    while stack:
+        path, top = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            child_top = top
+                            if path == contents_dir:
+                                child_top = entry.name
+                                info['dirs'][entry.name] = 0
+                            stack.append((entry.path, child_top))
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            size = st.st_size
+                            info['total'] += size
+                            if top is not None:
+                                info['dirs'][top] += size
+                            elif path == contents_dir:
+                                info['files'][entry.name] = size
+
+                            # 可执行位直接取自已有的stat结果，无需额外的access调用
+                            if path == macos_dir and st.st_mode & 0o111:
+                                info['executables'].append((entry.name, size))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+    return info
+
 
 class MacOSBuilder:
     def __init__(self):
         # 检查操作系统
-        self.system = platform.system().lower()
+        self.system = _SYSTEM
         if self.system != 'darwin':
             print("❌ 错误：此脚本仅适用于macOS系统")
-            print(f"   当前系统：{platform.system()}")
+            print(f"   当前系统：{_SYSTEM_NAME}")
             print("\n💡 请使用对应平台的构建脚本：")
             print("   Windows: python build_windows.py")
             print("   Linux: python build_linux.py")
             sys.exit(1)
 
-        self.arch = platform.machine().lower()
-        self.project_root = Path(__file__).resolve().parent
+        self.arch = _ARCH
+        self.project_root = _PROJECT_ROOT
         self.dist_dir = self.project_root / "dist"
         self.build_logs_dir = self.dist_dir / "build_logs"
 
@@ -39,11 +231,20 @@ class MacOSBuilder:
         self.upx_path = None
         self.upx_available = False
         self.upx_enabled = False  # 默认禁用
+
+        # 是否通过交互菜单运行（命令行模式下不询问UPX配置）
+        self.interactive = True
         self._detect_upx()
 
         # 编译器状态缓存
         self._compiler_available = None
 
+        # 会话级缓存：Xcode工具路径、图标查找结果、主程序分析结果
+        self._xcode_path = None
+        self._icon_cache = None
+        self._main_analysis_key = None
+        self._main_analysis_cache = None
+
         # 创建必要目录
         self.build_logs_dir.mkdir(exist_ok=True, parents=True)
 
@@ -58,7 +259,9 @@ class MacOSBuilder:
     def _load_app_info(self):
         """从app_info.py加载应用信息"""
         try:
-            sys.path.insert(0, str(self.project_root))
+            project_root = str(self.project_root)
+            if project_root not in sys.path:
+                sys.path.insert(0, project_root)
             from defaults.app_info import AppInfo
             self.app_name = getattr(AppInfo, 'NAME')
             self.version = getattr(AppInfo, 'VERSION')
@@ -91,11 +294,17 @@ class MacOSBuilder:
         if os.environ.get('UPX_PATH'):
             upx_paths.insert(0, os.environ.get('UPX_PATH'))
 
-        for upx_candidate in upx_paths:
-            if self._verify_upx(upx_candidate):
-                self.upx_path = upx_candidate
-                self.upx_available = True
-                break
+        # 并发验证所有候选路径，按优先级取第一个可用的
+        executor = ThreadPoolExecutor(max_workers=len(upx_paths))
+        try:
+            for upx_candidate, ok in zip(upx_paths, executor.map(self._verify_upx, upx_paths)):
+                if ok:
+                    self.upx_path = upx_candidate
+                    self.upx_available = True
+                    break
+        finally:
+            # 已找到可用路径时不等待其余探测结束
+            executor.shutdown(wait=False)
 
         if self.upx_available:
             print(f"✅ UPX可用: {self.upx_path}")
@@ -104,9 +313,17 @@ class MacOSBuilder:
 
     def _verify_upx(self, upx_path: str) -> bool:
         """验证UPX可执行文件"""
+        # 不存在或不可执行的候选无需启动子进程
+        if os.sep in upx_path:
+            if not (os.path.isfile(upx_path) and os.access(upx_path, os.X_OK)):
+                return False
+        elif shutil.which(upx_path) is None:
+            return False
+
         try:
             result = subprocess.run(
                 [upx_path, '--version'],
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 text=True,
                 timeout=3
@@ -115,52 +332,120 @@ class MacOSBuilder:
         except:
             return False
 
-    def _check_compiler(self) -> bool:
-        """检查编译器状态"""
-        if self._compiler_available is not None:
-            return self._compiler_available
-
+    def _probe_compiler(self) -> Optional[str]:
+        """查找可用的编译器，返回编译器名"""
         # macOS下检查clang
         compilers_to_check = ['clang']
 
         for compiler in compilers_to_check:
             try:
+                # 优先使用磁盘缓存的探测结果（路径仍可执行时有效）
+                cached_path = _read_probe_cache(f"compiler:{compiler}")
+                if cached_path and os.access(cached_path, os.X_OK):
+                    return compiler
+
                 result = subprocess.run(
                     ['which', compiler],
+                    stdin=subprocess.DEVNULL,
                     capture_output=True,
                     text=True,
                     timeout=5
                 )
                 if result.returncode == 0:
-                    self._compiler_available = True
-                    print(f"✅ 找到编译器: {compiler}")
-                    return True
+                    _write_probe_cache(f"compiler:{compiler}", result.stdout.strip())
+                    return compiler
             except:
                 continue
 
+        return None
+
+    def _check_compiler(self, probe: Optional[Future] = None) -> bool:
+        """检查编译器状态（probe为已提交的_probe_compiler任务）"""
+        if self._compiler_available is not None:
+            return self._compiler_available
+
+        compiler = probe.result() if probe is not None else self._probe_compiler()
+        if compiler:
+            self._compiler_available = True
+            print(f"✅ 找到编译器: {compiler}")
+            return True
+
         self._compiler_available = False
         return False
 
-    def _check_xcode_tools(self) -> bool:
-        """检查Xcode命令行工具"""
+    def _probe_xcode_tools(self) -> Optional[str]:
+        """运行 xcode-select -p，返回工具路径，未安装时返回None"""
+        # 优先使用磁盘缓存的探测结果（目录仍存在时有效）
+        cached_path = _read_probe_cache('xcode_path')
+        if cached_path and os.path.isdir(cached_path):
+            return cached_path
+
+        result = subprocess.run(
+            ['xcode-select', '-p'],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if result.returncode == 0:
+            xcode_path = result.stdout.strip()
+            _write_probe_cache('xcode_path', xcode_path)
+            return xcode_path
+        return None
+
+    def _check_xcode_tools(self, probe: Optional[Future] = None) -> bool:
+        """检查Xcode命令行工具（probe为已提交的_probe_xcode_tools任务）"""
         print("\n🔍 检查Xcode命令行工具...")
 
+        # 已确认安装的工具在会话中不会消失，直接复用
+        if self._xcode_path is not None:
+            print(f"  ✓ Xcode命令行工具: {self._xcode_path}")
+            return True
+
+        try:
+            xcode_path = probe.result() if probe is not None else self._probe_xcode_tools()
+        except:
+            print("  ✗ Xcode命令行工具: 检查失败")
+            return False
+
+        if xcode_path is not None:
+            self._xcode_path = xcode_path
+            print(f"  ✓ Xcode命令行工具: {xcode_path}")
+            return True
+        else:
+            print("  ✗ Xcode命令行工具: 未安装")
+            return False
+
+    def _probe_nuitka_version(self) -> Optional[str]:
+        """获取Nuitka版本，未安装时返回None"""
+        import importlib.util
+
+        # Nuitka仍可导入时复用缓存的版本，避免启动新的解释器
+        cache_key = f"nuitka_version:{sys.executable}"
+        try:
+            nuitka_installed = importlib.util.find_spec('nuitka') is not None
+        except (ImportError, ValueError):
+            nuitka_installed = False
+        if nuitka_installed:
+            cached_version = _read_probe_cache(cache_key)
+            if cached_version:
+                return cached_version
+
         try:
             result = subprocess.run(
-                ['xcode-select', '-p'],
+                [sys.executable, '-m', 'nuitka', '--version'],
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 text=True,
                 timeout=5
             )
             if result.returncode == 0:
-                print(f"  ✓ Xcode命令行工具: {result.stdout.strip()}")
-                return True
-            else:
-                print("  ✗ Xcode命令行工具: 未安装")
-                return False
+                version = result.stdout.strip()
+                _write_probe_cache(cache_key, version)
+                return version
         except:
-            print("  ✗ Xcode命令行工具: 检查失败")
-            return False
+            pass
+        return None
 
     def _prepare_build_environment(self) -> bool:
         """准备构建环境"""
@@ -189,8 +474,17 @@ class MacOSBuilder:
         """分析主程序文件"""
         main_file = self.project_root / 'main.py'
 
+        # main.py未修改时直接复用上次的分析结果
+        try:
+            stat = main_file.stat()
+            cache_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+        if cache_key is not None and cache_key == self._main_analysis_key:
+            return dict(self._main_analysis_cache)
+
         analysis = {
-            'exists': main_file.exists(),
+            'exists': cache_key is not None,
             'gui_framework': 'Console',
             'has_main_check': False,
         }
@@ -199,26 +493,20 @@ class MacOSBuilder:
             return analysis
 
         try:
-            with open(main_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # 检查入口点
-            if 'if __name__ == "__main__":' in content:
-                analysis['has_main_check'] = True
-
-            # 检测GUI框架
-            if 'PySide6' in content:
-                analysis['gui_framework'] = 'PySide6'
-            elif 'PyQt5' in content:
-                analysis['gui_framework'] = 'PyQt5'
-            elif 'PyQt6' in content:
-                analysis['gui_framework'] = 'PyQt6'
-            elif 'tkinter' in content:
-                analysis['gui_framework'] = 'Tkinter'
+            # 小文件直接读取；大文件用mmap扫描，避免整份复制到用户空间
+            with open(main_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+                    _scan_main_content(f.read(), analysis)
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        _scan_main_content(mm, analysis)
 
         except Exception as e:
             print(f"⚠️  文件分析异常: {e}")
+            return analysis
 
+        self._main_analysis_key = cache_key
+        self._main_analysis_cache = dict(analysis)
         return analysis
 
     def _configure_upx(self) -> bool:
@@ -234,6 +522,7 @@ class MacOSBuilder:
         try:
             result = subprocess.run(
                 [self.upx_path, '--version'],
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
                 text=True,
                 timeout=3
@@ -271,20 +560,31 @@ class MacOSBuilder:
             # ('CHANGELOG.txt', '更新日志'),
         ]
 
-        copied_count = 0
-        for filename, description in distribution_files:
-            source_path = self.project_root / filename
-
-            if not source_path.exists():
-                continue  # 文件不存在，跳过
-
+        def copy_one(filename: str) -> Optional[Exception]:
             try:
-                target_path = target_dir / filename
-                shutil.copy2(source_path, target_path)
-                print(f"  ✓ {description}: {filename}")
-                copied_count += 1
+                _clone_or_copy(self.project_root / filename, target_dir / filename)
+                return None
             except Exception as e:
-                print(f"  ✗ {description}: 复制失败 - {e}")
+                return e
+
+        # 只复制存在的文件
+        pending = [
+            (filename, description)
+            for filename, description in distribution_files
+            if (self.project_root / filename).exists()
+        ]
+
+        copied_count = 0
+        if pending:
+            # 各文件相互独立，并发复制；结果按原顺序输出
+            with ThreadPoolExecutor(max_workers=min(4, len(pending))) as executor:
+                errors = executor.map(copy_one, [filename for filename, _ in pending])
+                for (filename, description), error in zip(pending, errors):
+                    if error is None:
+                        print(f"  ✓ {description}: {filename}")
+                        copied_count += 1
+                    else:
+                        print(f"  ✗ {description}: 复制失败 - {error}")
 
         if copied_count > 0:
             print(f"✅ 已复制 {copied_count} 个分发文件")
@@ -294,21 +594,22 @@ class MacOSBuilder:
         return copied_count
 
     def _check_icon_file(self) -> Tuple[bool, Optional[Path]]:
-        """检查图标文件"""
-        icon_candidates = [
-            self.project_root / 'resources' / 'icons' / 'app_icon.icns',
-            self.project_root / 'resources' / 'icons' / 'app_icon.png',
-            self.project_root / 'app_icon.icns',
-        ]
+        """检查图标文件（查找结果在本次会话内缓存）"""
+        if self._icon_cache is None:
+            self._icon_cache = (False, None)
+            root = str(self.project_root)
+            for rel_path in _ICON_CANDIDATES:
+                if os.path.isfile(os.path.join(root, rel_path)):
+                    self._icon_cache = (True, self.project_root / rel_path)
+                    break
 
-        for icon_path in icon_candidates:
-            if icon_path.exists():
-                if icon_path.suffix == '.icns':
-                    print(f"✅ 找到.icns图标: {icon_path.relative_to(self.project_root)}")
-                    return True, icon_path
-                elif icon_path.suffix == '.png':
-                    print(f"⚠️  找到PNG图标，建议转换为.icns格式: {icon_path.relative_to(self.project_root)}")
-                    return True, icon_path
+        icon_found, icon_path = self._icon_cache
+        if icon_found:
+            if icon_path.suffix == '.icns':
+                print(f"✅ 找到.icns图标: {icon_path.relative_to(self.project_root)}")
+            else:
+                print(f"⚠️  找到PNG图标，建议转换为.icns格式: {icon_path.relative_to(self.project_root)}")
+            return True, icon_path
 
         print("⚠️  未找到.icns图标文件")
         print("💡 转换PNG到ICNS:")
@@ -394,45 +695,54 @@ class MacOSBuilder:
         print(f"⏳ 构建开始: {start_time.strftime('%H:%M:%S')}")
 
         try:
-            with open(log_file, 'w', encoding='utf-8') as log_f:
-                log_f.write(f"构建命令: {' '.join(cmd)}\n")
-                log_f.write(f"开始时间: {start_time}\n\n")
+            with open(log_file, 'wb', buffering=_LOG_BUFFER_SIZE) as log_f:
+                log_f.writelines(line.encode('utf-8') for line in (
+                    f"构建命令: {' '.join(cmd)}\n",
+                    f"开始时间: {start_time}\n\n",
+                ))
 
                 process = subprocess.Popen(
                     cmd,
+                    stdin=subprocess.DEVNULL,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace'
+                    bufsize=0
                 )
 
-                # 简化输出处理
+                # 原始字节按块读取：整块原样写入日志，只对完整行解码后过滤显示
+                stdout_fd = process.stdout.fileno()
                 last_progress = ""
-                for line in process.stdout:
-                    line = line.rstrip()
-                    log_f.write(line + '\n')
-
-                    # 只显示关键信息
-                    if 'progress:' in line.lower():
-                        # 只显示不同的进度信息
-                        if line != last_progress:
-                            print(f"  {line}")
-                            last_progress = line
-                    elif any(keyword in line.lower() for keyword in ['error:', 'failed:', 'fatal:']):
-                        print(f"  ❌ {line}")
-                    elif any(keyword in line.lower() for keyword in ['done', 'success', 'complete']):
-                        print(f"  ✅ {line}")
-                    elif 'upx' in line.lower() and ('compressing' in line.lower() or 'packed' in line.lower()):
-                        print(f"  📦 {line}")
+                pending: List[bytes] = []
+                while True:
+                    chunk = os.read(stdout_fd, _PIPE_READ_SIZE)
+                    if not chunk:
+                        break
+                    log_f.write(chunk)
+
+                    # 只扫描新读到的块：进度条用 \r 原地刷新，与 \n 一样视为行尾；
+                    # 未结束的行片段暂存在列表中，遇到行尾时才拼接，避免反复复制整个缓冲
+                    *lines, tail = _LINE_SEPARATOR.split(chunk)
+                    if lines:
+                        pending.append(lines[0])
+                        lines[0] = b"".join(pending)
+                        pending.clear()
+                        for raw in lines:
+                            last_progress = self._show_build_line(raw, last_progress)
+                    if tail:
+                        pending.append(tail)
+
+                if pending:
+                    self._show_build_line(b"".join(pending), last_progress)
 
                 process.wait()
                 end_time = datetime.now()
                 elapsed = end_time - start_time
 
-                log_f.write(f"\n结束时间: {end_time}\n")
-                log_f.write(f"耗时: {elapsed.total_seconds():.1f}秒\n")
-                log_f.write(f"退出码: {process.returncode}\n")
+                log_f.writelines(line.encode('utf-8') for line in (
+                    f"\n结束时间: {end_time}\n",
+                    f"耗时: {elapsed.total_seconds():.1f}秒\n",
+                    f"退出码: {process.returncode}\n",
+                ))
 
             print(f"⏱️  构建耗时: {elapsed.total_seconds():.1f}秒")
 
@@ -447,25 +757,47 @@ class MacOSBuilder:
             print(f"❌ 构建异常: {e}")
             return None
 
+    def _show_build_line(self, raw: bytes, last_progress: str) -> str:
+        """过滤并显示一行构建输出，返回最新的进度行"""
+        # 进度条可能用 \r 原地刷新，拆分后逐条处理
+        for line in raw.decode('utf-8', 'replace').rstrip().split('\r'):
+            if not line:
+                continue
+
+            # 只显示关键信息（一次正则扫描找出行内所有关键字，再按优先级判定）
+            found = {m.lastgroup for m in _BUILD_LINE_PATTERN.finditer(line)}
+            if not found:
+                continue
+            if 'progress' in found:
+                # 只显示不同的进度信息
+                if line != last_progress:
+                    print(f"  {line}")
+                    last_progress = line
+            elif 'error' in found:
+                print(f"  ❌ {line}")
+            elif 'success' in found:
+                print(f"  ✅ {line}")
+            elif 'upx' in found and 'packing' in found:
+                print(f"  📦 {line}")
+
+        return last_progress
+
     def _locate_output_file(self, output_name: str) -> Optional[Path]:
         """定位生成的输出文件"""
         # 查找.app应用包
         app_bundle_path = self.dist_dir / f"main.app"
 
         if app_bundle_path.exists():
-            # 计算整个.app包的大小
-            app_size = 0
-            for path in app_bundle_path.rglob('*'):
-                if path.is_file():
-                    app_size += path.stat().st_size
+            # 一次遍历得到整个.app包的大小及结构信息
+            bundle_info = _scan_app_bundle(app_bundle_path)
 
-            size_mb = app_size / 1024 / 1024
+            size_mb = bundle_info['total'] / 1024 / 1024
 
             print(f"📦 应用包: {app_bundle_path}")
             print(f"📊 应用包大小: {size_mb:.2f} MB")
 
             # 显示应用包结构
-            self._show_app_bundle_structure(app_bundle_path)
+            self._show_app_bundle_structure(app_bundle_path, bundle_info)
 
             # ✅ 复制分发文件到.app包的Resources目录
             resources_dir = app_bundle_path / "Contents" / "Resources"
@@ -480,8 +812,8 @@ class MacOSBuilder:
         print("⚠️  未找到.app应用包")
         return None
 
-    def _show_app_bundle_structure(self, app_path: Path):
-        """显示.app应用包的结构"""
+    def _show_app_bundle_structure(self, app_path: Path, bundle_info: Dict):
+        """显示.app应用包的结构（bundle_info来自_scan_app_bundle）"""
         print(f"📂 应用包结构:")
 
         indent = "  "
@@ -490,40 +822,32 @@ class MacOSBuilder:
         plist_path = app_path / "Contents" / "Info.plist"
         if plist_path.exists():
             try:
-                # 使用plutil读取plist信息
-                result = subprocess.run(
-                    ['plutil', '-p', str(plist_path)],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    for line in lines:
-                        if 'CFBundleName' in line or 'CFBundleVersion' in line or 'CFBundleIdentifier' in line:
-                            print(f"{indent}📄 {line.strip()}")
+                # 使用plistlib直接解析plist信息
+                with open(plist_path, 'rb') as f:
+                    plist = plistlib.load(f)
+                for key in ('CFBundleIdentifier', 'CFBundleName', 'CFBundleVersion'):
+                    if key in plist:
+                        print(f'{indent}📄 "{key}" => "{plist[key]}"')
             except:
                 pass
 
         # 显示主要目录结构
-        contents_path = app_path / "Contents"
-        if contents_path.exists():
-            for item in sorted(contents_path.iterdir()):
-                if item.name == '.DS_Store':
-                    continue
-                if item.is_dir():
-                    dir_size = sum(f.stat().st_size for f in item.rglob('*') if f.is_file()) / 1024
-                    print(f"{indent}📁 {item.name}/ ({dir_size:.1f} KB)")
-
-                    # 显示MacOS目录中的可执行文件
-                    if item.name == "MacOS":
-                        for exe_file in sorted(item.iterdir()):
-                            if exe_file.is_file() and os.access(exe_file, os.X_OK):
-                                exe_size = exe_file.stat().st_size / 1024
-                                print(f"{indent}  🚀 {exe_file.name} ({exe_size:.1f} KB)")
-                elif item.is_file():
-                    file_size = item.stat().st_size / 1024
-                    print(f"{indent}📄 {item.name} ({file_size:.1f} KB)")
+        dirs = bundle_info['dirs']
+        files = bundle_info['files']
+        for name in sorted([*dirs, *files]):
+            if name == '.DS_Store':
+                continue
+            if name in dirs:
+                dir_size = dirs[name] / 1024
+                print(f"{indent}📁 {name}/ ({dir_size:.1f} KB)")
+
+                # 显示MacOS目录中的可执行文件
+                if name == "MacOS":
+                    for exe_name, exe_size in sorted(bundle_info['executables']):
+                        print(f"{indent}  🚀 {exe_name} ({exe_size / 1024:.1f} KB)")
+            else:
+                file_size = files[name] / 1024
+                print(f"{indent}📄 {name} ({file_size:.1f} KB)")
 
     def _create_launcher_script(self, app_path: Path):
         """创建启动脚本"""
@@ -553,19 +877,32 @@ open "{app_path.name}"
 
     def _clean_old_builds(self):
         """清理旧的构建文件"""
+        import fnmatch
+
         print("\n🧹 清理旧构建...")
 
-        patterns = ["build", ".build", "*.dist", "*.app"]
-        cleaned = 0
+        patterns = ("build", ".build", "*.dist", "*.app")
 
-        for pattern in patterns:
-            for path in self.project_root.rglob(pattern):
-                if path.is_dir():
-                    try:
-                        shutil.rmtree(path, ignore_errors=True)
-                        cleaned += 1
-                    except:
-                        pass
+        # 一次遍历匹配所有模式，匹配到的目录不再向下遍历
+        targets = []
+        for dirpath, dirnames, _ in os.walk(self.project_root):
+            # 跳过版本库、虚拟环境等与构建无关的大目录
+            dirnames[:] = [d for d in dirnames if d not in _CLEAN_SKIP_DIRS]
+            for name in list(dirnames):
+                full_path = os.path.join(dirpath, name)
+                if os.path.islink(full_path):
+                    continue
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                    targets.append(full_path)
+                    dirnames.remove(name)
+
+        cleaned = 0
+        if targets:
+            # 多个目录树相互独立，并行删除
+            workers = min(os.cpu_count() or 1, len(targets))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(lambda p: shutil.rmtree(p, ignore_errors=True), targets):
+                    cleaned += 1
 
         if cleaned > 0:
             print(f"✅ 清理完成，删除了 {cleaned} 个目录")
@@ -599,8 +936,8 @@ open "{app_path.name}"
             print("❌ 构建环境准备失败")
             return False
 
-        # UPX配置询问
-        if self.upx_available:
+        # UPX配置询问（非交互模式下使用命令行参数）
+        if self.upx_available and self.interactive:
             self._configure_upx()
 
         # 清理旧构建
@@ -644,33 +981,37 @@ open "{app_path.name}"
 
         # Python信息
         print(f"\n📝 Python环境:")
-        print(f"   版本: {platform.python_version()}")
+        print(f"   版本: {_PY_VERSION}")
         print(f"   路径: {sys.executable}")
 
-        # Nuitka检查
-        print(f"\n📦 Nuitka检查:")
-        try:
-            result = subprocess.run(
-                [sys.executable, '-m', 'nuitka', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                print(f"   版本: {result.stdout.strip()}")
+        # 相互独立的探测并发执行，结果按固定顺序输出
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            nuitka_probe = executor.submit(self._probe_nuitka_version)
+            xcode_probe = None
+            if self._xcode_path is None:
+                xcode_probe = executor.submit(self._probe_xcode_tools)
+            compiler_probe = None
+            if self._compiler_available is None:
+                compiler_probe = executor.submit(self._probe_compiler)
+
+            # Nuitka检查
+            print(f"\n📦 Nuitka检查:")
+            nuitka_version = nuitka_probe.result()
+            if nuitka_version is not None:
+                print(f"   版本: {nuitka_version}")
             else:
                 print("   ❌ 未安装")
-        except:
-            print("   ❌ 未安装")
 
-        # Xcode工具检查
-        print(f"\n🔧 Xcode命令行工具检查:")
-        xcode_ok = self._check_xcode_tools()
-        print(f"   状态: {'✅ 就绪' if xcode_ok else '❌ 未找到'}")
+            # Xcode工具检查
+            print(f"\n🔧 Xcode命令行工具检查:")
+            xcode_ok = self._check_xcode_tools(xcode_probe)
+            print(f"   状态: {'✅ 就绪' if xcode_ok else '❌ 未找到'}")
 
-        # 编译器检查
-        print(f"\n🔧 编译器检查:")
-        if self._check_compiler():
+            # 编译器检查
+            print(f"\n🔧 编译器检查:")
+            compiler_ok = self._check_compiler(compiler_probe)
+
+        if compiler_ok:
             print("   ✅ Clang编译器就绪")
         else:
             print("   ❌ 未找到Clang编译器")
@@ -713,6 +1054,12 @@ open "{app_path.name}"
 
     def run(self):
         """运行主界面"""
+        actions = {
+            '1': self.build,
+            '2': self.diagnose,
+            '3': self._clean_old_builds,
+        }
+
         while True:
             try:
                 print(f"\n请选择操作:")
@@ -723,25 +1070,23 @@ open "{app_path.name}"
 
                 choice = input(f"\n请输入选项 (1-4): ").strip()
 
-                if choice == '1':
-                    self.build()
-                elif choice == '2':
-                    self.diagnose()
-                elif choice == '3':
-                    self._clean_old_builds()
-                elif choice == '4':
+                if choice == '4':
                     print("👋 再见！")
                     break
-                else:
+
+                action = actions.get(choice)
+                if action is None:
                     print("❌ 无效选项")
+                    continue
+
+                action()
 
                 # 询问是否继续
-                if choice in ['1', '2', '3']:
-                    continue_choice = input("\n是否继续? (y/n, 默认y): ").strip().lower()
-                    if continue_choice == 'n':
-                        print("👋 再见！")
-                        break
-                    print("\n" + "="*60)
+                continue_choice = input("\n是否继续? (y/n, 默认y): ").strip().lower()
+                if continue_choice == 'n':
+                    print("👋 再见！")
+                    break
+                print("\n" + "="*60)
 
             except KeyboardInterrupt:
                 print("\n\n🛑 用户中断")
@@ -749,13 +1094,39 @@ open "{app_path.name}"
             except Exception as e:
                 print(f"❌ 错误: {e}")
 
+def _parse_args():
+    """解析命令行参数（不带参数时进入交互菜单）"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="macOS平台专用构建脚本")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--build', action='store_true', help="构建.app应用包")
+    group.add_argument('--diagnose', action='store_true', help="系统诊断")
+    group.add_argument('--clean', action='store_true', help="清理构建文件")
+    parser.add_argument('--upx', action='store_true', help="构建时启用UPX压缩（配合 --build 使用）")
+    return parser.parse_args()
+
+
 def main():
     """主函数"""
+    args = _parse_args()
     try:
         builder = MacOSBuilder()
-        builder.run()
+
+        # 非交互模式：直接执行指定操作，适用于CI/脚本
+        if args.build:
+            builder.interactive = False
+            builder.upx_enabled = args.upx and builder.upx_available
+            sys.exit(0 if builder.build() else 1)
+        elif args.diagnose:
+            builder.diagnose()
+        elif args.clean:
+            builder._clean_old_builds()
+        else:
+            builder.run()
     except Exception as e:
         print(f"❌ 启动失败: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
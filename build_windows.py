@@ -8,14 +8,114 @@ Windows平台专用构建脚本
 
 import os
 import sys
+import re
+import json
+import hashlib
 import platform
+import functools
 import subprocess
 import shutil
-import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Tuple, Dict
 
+
+@functools.lru_cache(maxsize=512)
+def _cached_exists(path_str: str) -> bool:
+    """带缓存的路径存在性检查，避免重复探测同一路径"""
+    return os.path.exists(path_str)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_copy_file_ex():
+    """加载kernel32并声明CopyFileExW签名，不可用时返回None"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+        copy_file_ex = ctypes.WinDLL('kernel32', use_last_error=True).CopyFileExW
+        # BOOL CopyFileExW(LPCWSTR, LPCWSTR, LPPROGRESS_ROUTINE, LPVOID, LPBOOL, DWORD)
+        copy_file_ex.argtypes = [
+            wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p,
+            ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD,
+        ]
+        copy_file_ex.restype = wintypes.BOOL
+        return copy_file_ex
+    except (OSError, AttributeError, ImportError):
+        return None
+
+
+def _win_copy(src: Path, dst: Path):
+    """复制文件：优先使用 CopyFileExW（内核完成数据与元数据复制），失败时回退到shutil.copy2"""
+    copy_file_ex = _load_copy_file_ex()
+    if copy_file_ex is not None and copy_file_ex(str(src), str(dst), None, None, None, 0):
+        return
+
+    shutil.copy2(src, dst)
+
+
+def _dir_size(root) -> int:
+    """统计目录下所有文件的总大小（复用DirEntry缓存的stat信息）"""
+    total = 0
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+# 构建输出关键字（一次扫描找出行内所有关键字，再按优先级判定类别）
+_BUILD_LINE_PATTERN = re.compile(
+    rb'(?P<progress>progress:)'
+    rb'|(?P<error>error:|failed:|fatal:)'
+    rb'|(?P<success>done|success|complete)'
+    rb'|(?P<upx>upx)'
+    rb'|(?P<packing>compressing|packed)',
+    re.IGNORECASE
+)
+
+# 主程序扫描关键字（入口点与GUI框架，一次扫描全部找出）
+_MAIN_FILE_PATTERN = re.compile(
+    rb'(?P<main_check>if __name__ == "__main__":)'
+    rb'|(?P<PySide6>PySide6)'
+    rb'|(?P<PyQt5>PyQt5)'
+    rb'|(?P<PyQt6>PyQt6)'
+    rb'|(?P<tkinter>tkinter)'
+)
+
+# GUI框架检测优先级：(匹配组名, 框架名)
+_GUI_FRAMEWORKS = (
+    ('PySide6', 'PySide6'),
+    ('PyQt5', 'PyQt5'),
+    ('PyQt6', 'PyQt6'),
+    ('tkinter', 'Tkinter'),
+)
+
+# 需要清理的构建目录名（另外还有 *.dist）
+_CLEAN_DIR_NAMES = frozenset({'build', '.build'})
+
+# 管道读取块大小与日志写入缓冲
+_PIPE_READ_SIZE = 64 * 1024
+_LOG_BUFFER_SIZE = 64 * 1024
+
+# MSVC环境缓存格式版本（变更缓存内容时递增，使旧缓存失效）
+_VS_ENV_CACHE_VERSION = 2
+# 缓存中记录激活脚本添加到 PATH 的条目所用的键
+_PATH_KEY = '__PATH_PREPEND__'
+
+# 构建输出的行尾：\n 或进度条原地刷新用的 \r
+_LINE_SEPARATOR = re.compile(rb'[\r\n]')
+
+
 class WindowsBuilder:
     def __init__(self):
         # 检查操作系统
@@ -36,6 +136,27 @@ class WindowsBuilder:
         # 应用信息
         self._load_app_info()
 
+        # 工具路径查找缓存（PATH变化时清空）
+        self._tool_paths: Dict[str, Optional[str]] = {}
+
+        # MSVC检查通过后的结果缓存（激活环境时清空）
+        self._msvc_check_result: Optional[Tuple[bool, str]] = None
+
+        # 主程序分析缓存：((修改时间, 大小), 分析结果)
+        self._main_analysis_cache: Optional[Tuple[Tuple[int, int], Dict]] = None
+
+        # 图标与数据目录（首次构建时解析）
+        self._icon_path: Optional[Path] = None
+        self._data_dirs: Optional[List[Path]] = None
+
+        # 菜单选项与对应操作
+        self._actions = {
+            '1': functools.partial(self.build, with_console=False),
+            '2': functools.partial(self.build, with_console=True),
+            '3': self.diagnose,
+            '4': self._clean_old_builds,
+        }
+
         # Visual Studio Build Tools 路径
         self.vs_build_tools_path = self._find_vs_build_tools()
 
@@ -58,6 +179,9 @@ class WindowsBuilder:
 
     def _load_app_info(self):
         """从app_info.py加载应用信息"""
+        # Windows版本信息（构建命令使用，读取失败时为None）
+        self._win_version_info = None
+
         try:
             sys.path.insert(0, str(self.project_root))
             from defaults.app_info import AppInfo
@@ -65,6 +189,11 @@ class WindowsBuilder:
             self.version = getattr(AppInfo, 'VERSION')
             self.author = getattr(AppInfo, 'AUTHOR')
 
+            try:
+                self._win_version_info = AppInfo.get_windows_version_info()
+            except Exception as e:
+                print(f"⚠️  读取Windows版本信息失败: {e}")
+
         except ImportError:
             print("⚠️  未找到 defaults/app_info.py，使用默认值")
             self.app_name = "BindInterfaceProxy"
@@ -94,7 +223,7 @@ class WindowsBuilder:
         ]
 
         for path in possible_paths:
-            if os.path.exists(path):
+            if _cached_exists(path):
                 print(f"✅ 找到VS构建工具: {path}")
                 return path
 
@@ -109,9 +238,7 @@ class WindowsBuilder:
         if os.environ.get('UPX_PATH'):
             upx_paths.append(os.environ.get('UPX_PATH'))
 
-        project_upx = self.project_root / "upx" / "upx.exe"
-        if project_upx.exists():
-            upx_paths.append(str(project_upx))
+        upx_paths.append(str(self.project_root / "upx" / "upx.exe"))
 
         common_paths = [
             r"C:\Program Files\upx\upx.exe",
@@ -120,9 +247,23 @@ class WindowsBuilder:
         ]
         upx_paths.extend(common_paths)
 
-        upx_paths.append("upx.exe")
+        # PATH中的upx.exe解析为完整路径后参与去重
+        path_upx = shutil.which("upx.exe")
+        if path_upx:
+            upx_paths.append(path_upx)
 
+        # 去重并过滤不存在的路径，只对剩余候选启动进程验证
+        candidates = []
+        seen = set()
         for upx_candidate in upx_paths:
+            norm = os.path.normcase(os.path.abspath(upx_candidate))
+            if norm in seen:
+                continue
+            seen.add(norm)
+            if _cached_exists(norm):
+                candidates.append(upx_candidate)
+
+        for upx_candidate in candidates:
             if self._verify_upx(upx_candidate):
                 self.upx_path = upx_candidate
                 self.upx_available = True
@@ -135,33 +276,89 @@ class WindowsBuilder:
 
     def _verify_upx(self, upx_path: str) -> bool:
         """验证UPX可执行文件"""
+        # 绝对路径不存在时无需启动进程
+        if os.path.isabs(upx_path) and not _cached_exists(upx_path):
+            return False
+
         try:
             result = subprocess.run(
                 [upx_path, '--version'],
                 capture_output=True,
-                text=True,
-                timeout=3,
+                timeout=1,
                 creationflags=subprocess.CREATE_NO_WINDOW
             )
-            return result.returncode == 0 and 'UPX' in result.stdout
+            return result.returncode == 0 and b'UPX' in result.stdout
         except:
             return False
 
+    def _which(self, tool: str) -> Optional[str]:
+        """在PATH中查找工具（结果按工具名缓存）"""
+        if tool not in self._tool_paths:
+            self._tool_paths[tool] = shutil.which(tool)
+        return self._tool_paths[tool]
+
     def _check_compiler(self) -> bool:
         """检查编译器状态"""
+        return self._which('cl.exe') is not None
+
+    def _vs_env_cache_file(self) -> Optional[Path]:
+        """MSVC环境缓存文件路径（以激活脚本路径和修改时间为键）"""
         try:
-            result = subprocess.run(
-                'where cl.exe',
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
-            return result.returncode == 0
-        except:
+            mtime = os.path.getmtime(self.vs_build_tools_path)
+        except OSError:
+            return None
+
+        key = hashlib.sha1(f"{self.vs_build_tools_path}:{mtime}:{_VS_ENV_CACHE_VERSION}".encode('utf-8')).hexdigest()
+        return self.build_logs_dir / f"vsenv_{key}.json"
+
+    def _load_vs_env_cache(self, cache_file: Optional[Path]) -> bool:
+        """从缓存加载MSVC环境变量"""
+        if cache_file is None:
             return False
 
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                env_delta = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if not isinstance(env_delta, dict) or not env_delta:
+            return False
+
+        # PATH 只缓存了激活脚本添加的条目，加到当前 PATH 前面，不覆盖用户现在的 PATH
+        path_prepend = env_delta.pop(_PATH_KEY, None)
+        os.environ.update(env_delta)
+        if path_prepend:
+            current = os.environ.get('PATH', '')
+            existing = {entry.lower() for entry in current.split(os.pathsep)}
+            missing = [entry for entry in path_prepend.split(os.pathsep) if entry and entry.lower() not in existing]
+            if missing:
+                os.environ['PATH'] = os.pathsep.join(missing + [current]) if current else os.pathsep.join(missing)
+        return True
+
+    def _save_vs_env_cache(self, cache_file: Optional[Path], env_delta: Dict[str, str], path_before: str):
+        """保存激活脚本新增/修改的环境变量（原子替换，失败时忽略）"""
+        if cache_file is None or not env_delta:
+            return
+
+        # 完整的 PATH 含有本次会话原有的条目，只保存激活脚本添加的部分
+        env_delta = {key: value for key, value in env_delta.items() if key.upper() != 'PATH'}
+        path_after = os.environ.get('PATH', '')
+        if path_after != path_before:
+            existing = {entry.lower() for entry in path_before.split(os.pathsep)}
+            added = [entry for entry in path_after.split(os.pathsep) if entry and entry.lower() not in existing]
+            if added:
+                env_delta[_PATH_KEY] = os.pathsep.join(added)
+
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(env_delta, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
     def _activate_vs_environment(self) -> Tuple[bool, str]:
         """激活MSVC环境"""
         if not self.vs_build_tools_path:
@@ -170,96 +367,59 @@ class WindowsBuilder:
         print(f"\n🔧 正在激活MSVC环境...")
         print(f"  使用激活脚本: {self.vs_build_tools_path}")
 
-        # 创建激活批处理
-        activation_script = tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix='.bat',
-            delete=False,
-            encoding='utf-8'
-        )
-
-        activation_script.write(f'''@echo off
-echo 正在激活Visual Studio Build Tools环境...
-call "{self.vs_build_tools_path}"
-
-echo ===============================
-echo 环境激活完成
-echo ===============================
-
-echo 检查编译器...
-where cl.exe >nul 2>&1
-if %errorlevel% equ 0 (
-    echo ✓ cl.exe 可用
-    cl.exe 2>&1 | findstr /i "Microsoft" >nul
-    if %errorlevel% equ 0 (
-        echo ✓ Microsoft C++ 编译器就绪
-    )
-)
-
-echo.
-echo 当前环境变量：
-echo PATH中包含的编译器：
-where cl.exe 2>nul
-where link.exe 2>nul
-where nmake.exe 2>nul
-
-echo.
-set > "%TEMP%\\vs_env_vars.txt"
-echo 环境变量已保存到：%TEMP%\\vs_env_vars.txt
-
-exit 0
-''')
+        # 激活脚本未变化时直接复用上次的环境变量
+        cache_file = self._vs_env_cache_file()
+        env_snapshot = dict(os.environ)
+        if self._load_vs_env_cache(cache_file):
+            self._tool_paths.clear()
+            self._msvc_check_result = None
+            if self._which('cl.exe'):
+                print("✅ 已从缓存加载MSVC环境")
+                return True, "MSVC环境已从缓存加载"
+
+            # 工具集更新后激活脚本可能未变但缓存的路径已失效：恢复环境，丢弃缓存后重新激活
+            print("  ⚠️  缓存的MSVC环境已失效，重新执行激活脚本")
+            os.environ.clear()
+            os.environ.update(env_snapshot)
+            self._tool_paths.clear()
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
 
-        activation_script.close()
-        bat_path = activation_script.name
+        # Windows环境变量名不区分大小写，统一按大写比较
+        env_before = {key.upper(): value for key, value in os.environ.items()}
 
         try:
-            # 运行激活脚本
+            # 在同一个cmd进程中调用激活脚本并直接输出环境变量，无需临时文件
             print("  执行激活脚本...")
             result = subprocess.run(
-                ['cmd', '/c', bat_path],
+                ['cmd', '/c', f'call "{self.vs_build_tools_path}" >nul && set'],
                 capture_output=True,
                 text=True,
-                encoding='gbk',
+                encoding='mbcs',
                 errors='replace',
                 timeout=30
             )
 
-            # 读取保存的环境变量
-            env_vars_file = os.path.join(os.environ.get('TEMP', ''), 'vs_env_vars.txt')
-            if os.path.exists(env_vars_file):
-                try:
-                    with open(env_vars_file, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if '=' in line:
-                                key, value = line.split('=', 1)
-                                os.environ[key] = value
-                    print("  ✓ 已更新环境变量")
-                except:
-                    pass
-
-            # 清理临时文件
-            try:
-                os.unlink(bat_path)
-                if os.path.exists(env_vars_file):
-                    os.unlink(env_vars_file)
-            except:
-                pass
-
             if result.returncode == 0:
+                # 只应用激活脚本新增或修改的变量
+                env_delta = {}
+                for line in result.stdout.splitlines():
+                    key, sep, value = line.partition('=')
+                    if sep and key and env_before.get(key.upper()) != value:
+                        env_delta[key] = value
+
+                os.environ.update(env_delta)
+                self._tool_paths.clear()
+                self._msvc_check_result = None
+                print(f"  ✓ 已更新 {len(env_delta)} 个环境变量")
                 print("✅ MSVC环境激活成功")
 
-                # 验证编译器
-                verify_result = subprocess.run(
-                    'where cl.exe && cl.exe 2>&1 | findstr /i Microsoft',
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    encoding='gbk'
-                )
+                self._save_vs_env_cache(cache_file, env_delta, env_before.get('PATH', ''))
 
-                if verify_result.returncode == 0:
+                # 验证编译器（版本信息由后续的 _check_msvc_tools 检查）
+                if self._which('cl.exe'):
                     print("  ✓ 编译器验证通过")
                     return True, "MSVC环境已激活并验证"
                 else:
@@ -270,16 +430,16 @@ exit 0
                 return False, f"激活失败: {error_msg}"
 
         except Exception as e:
-            try:
-                os.unlink(bat_path)
-            except:
-                pass
             return False, f"激活异常: {str(e)}"
 
     def _check_msvc_tools(self) -> Tuple[bool, str]:
         """检查MSVC编译器状态"""
         print("\n🔍 检查MSVC编译器...")
 
+        if self._msvc_check_result is not None:
+            print("  ✓ 编译器已检查通过（使用缓存结果）")
+            return self._msvc_check_result
+
         checks = [
             ("cl.exe", "C/C++ 编译器"),
             ("link.exe", "链接器"),
@@ -289,48 +449,39 @@ exit 0
 
         all_ok = True
         for tool, description in checks:
-            try:
-                result = subprocess.run(
-                    ['where', tool],
-                    capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=5
-                )
-
-                if result.returncode == 0:
-                    path = result.stdout.strip().split('\n')[0]
-                    print(f"  ✓ {description}: {path}")
-                else:
-                    print(f"  ✗ {description}: 未找到")
-                    all_ok = False
-            except Exception as e:
-                print(f"  ✗ {description}: 检查失败 - {e}")
+            path = self._which(tool)
+            if path:
+                print(f"  ✓ {description}: {path}")
+            else:
+                print(f"  ✗ {description}: 未找到")
                 all_ok = False
 
-        # 检查cl.exe版本
+        # 检查cl.exe版本（唯一需要启动进程的检查）
         if all_ok:
             try:
                 version_result = subprocess.run(
-                    ['cl.exe'],
+                    [self._which('cl.exe')],
                     capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=5
+                    timeout=5,
+                    creationflags=subprocess.CREATE_NO_WINDOW
                 )
 
+                # 按字节匹配，只解码需要显示的版本行
                 output = version_result.stdout + version_result.stderr
-                if 'Microsoft' in output:
+                if b'Microsoft' in output:
                     # 提取版本信息
-                    for line in output.split('\n'):
-                        if 'Version' in line:
-                            print(f"  📊 {line.strip()}")
+                    for line in output.split(b'\n'):
+                        if b'Version' in line:
+                            print(f"  📊 {line.strip().decode('mbcs', 'replace')}")
                             break
                 else:
                     print("  ⚠️  无法获取编译器版本")
             except:
                 print("  ⚠️  无法检查编译器版本")
 
+        if all_ok:
+            self._msvc_check_result = (True, "编译器检查完成")
+
         return all_ok, "编译器检查完成"
 
     def _prepare_build_environment(self) -> bool:
@@ -339,6 +490,11 @@ exit 0
         print("准备Windows构建环境")
         print(f"{'='*60}")
 
+        # 已在VS开发者命令提示符中运行时无需再检查
+        if os.environ.get('VSINSTALLDIR') and os.environ.get('VCToolsInstallDir'):
+            print("✅ 已在Visual Studio开发者环境中运行，MSVC编译器已就绪")
+            return True
+
         # 1. 检查是否已激活
         print("\n1. 检查当前环境状态...")
         compiler_ok, msg = self._check_msvc_tools()
@@ -412,8 +568,17 @@ exit 0
         """分析主程序文件"""
         main_file = self.project_root / 'main.py'
 
+        # main.py未修改时直接复用上次的分析结果
+        try:
+            stat = main_file.stat()
+            cache_key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            cache_key = None
+        if cache_key is not None and self._main_analysis_cache and self._main_analysis_cache[0] == cache_key:
+            return dict(self._main_analysis_cache[1])
+
         analysis = {
-            'exists': main_file.exists(),
+            'exists': cache_key is not None,
             'gui_framework': 'Console',
             'has_main_check': False,
         }
@@ -422,26 +587,30 @@ exit 0
             return analysis
 
         try:
-            with open(main_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # 按行流式扫描字节内容，结果已确定时提前结束
+            found = set()
+            with open(main_file, 'rb') as f:
+                for line in f:
+                    found.update(m.lastgroup for m in _MAIN_FILE_PATTERN.finditer(line))
+                    # 入口点和最高优先级的框架都已找到，无需继续读取
+                    if 'main_check' in found and 'PySide6' in found:
+                        break
 
             # 检查入口点
-            if 'if __name__ == "__main__":' in content:
+            if 'main_check' in found:
                 analysis['has_main_check'] = True
 
-            # 检测GUI框架
-            if 'PySide6' in content:
-                analysis['gui_framework'] = 'PySide6'
-            elif 'PyQt5' in content:
-                analysis['gui_framework'] = 'PyQt5'
-            elif 'PyQt6' in content:
-                analysis['gui_framework'] = 'PyQt6'
-            elif 'tkinter' in content:
-                analysis['gui_framework'] = 'Tkinter'
+            # 检测GUI框架（按优先级）
+            for group, name in _GUI_FRAMEWORKS:
+                if group in found:
+                    analysis['gui_framework'] = name
+                    break
 
         except Exception as e:
             print(f"⚠️  文件分析异常: {e}")
+            return analysis
 
+        self._main_analysis_cache = (cache_key, dict(analysis))
         return analysis
 
     def _configure_upx(self) -> bool:
@@ -458,13 +627,12 @@ exit 0
             result = subprocess.run(
                 [self.upx_path, '--version'],
                 capture_output=True,
-                text=True,
-                timeout=3
+                timeout=3,
+                creationflags=subprocess.CREATE_NO_WINDOW
             )
-            if result.stdout:
-                lines = result.stdout.strip().split('\n')
-                if lines:
-                    print(f"   版本: {lines[0]}")
+            first_line = result.stdout.strip().split(b'\n', 1)[0]
+            if first_line:
+                print(f"   版本: {first_line.strip().decode('mbcs', 'replace')}")
         except:
             pass
 
@@ -498,12 +666,12 @@ exit 0
         for filename, description in distribution_files:
             source_path = self.project_root / filename
 
-            if not source_path.exists():
+            if not _cached_exists(str(source_path)):
                 continue  # 文件不存在，跳过
 
             try:
                 target_path = target_dir / filename
-                shutil.copy2(source_path, target_path)
+                _win_copy(source_path, target_path)
                 print(f"  ✓ {description}: {filename}")
                 copied_count += 1
             except Exception as e:
@@ -516,6 +684,33 @@ exit 0
 
         return copied_count
 
+    def _resolve_icon(self) -> Optional[Path]:
+        """查找应用图标（结果缓存）"""
+        if self._icon_path is None:
+            icon_candidates = [
+                self.project_root / 'resources' / 'icons' / 'app_icon.ico',
+                self.project_root / 'resources' / 'icons' / 'app_icon.png',
+                self.project_root / 'app_icon.ico',
+            ]
+
+            for icon_path in icon_candidates:
+                if _cached_exists(str(icon_path)):
+                    self._icon_path = icon_path
+                    break
+
+        return self._icon_path
+
+    def _resolve_data_dirs(self) -> List[Path]:
+        """查找需要包含的数据目录（结果缓存）"""
+        if self._data_dirs is None:
+            data_dirs = ['resources']
+            self._data_dirs = [
+                self.project_root / data_dir for data_dir in data_dirs
+                if _cached_exists(str(self.project_root / data_dir))
+            ]
+
+        return self._data_dirs
+
     def _create_build_command(self, main_file: Path, with_console: bool, analysis: Dict) -> Tuple[List[str], str]:
         """创建构建命令"""
         cmd = [sys.executable, '-m', 'nuitka', '--standalone']
@@ -559,28 +754,17 @@ exit 0
             cmd.append('--enable-plugin=tk-inter')
 
         # 图标
-        icon_candidates = [
-            self.project_root / 'resources' / 'icons' / 'app_icon.ico',
-            self.project_root / 'resources' / 'icons' / 'app_icon.png',
-            self.project_root / 'app_icon.ico',
-        ]
-
-        for icon_path in icon_candidates:
-            if icon_path.exists():
-                cmd.append(f'--windows-icon-from-ico={icon_path}')
-                break
+        icon_path = self._resolve_icon()
+        if icon_path:
+            cmd.append(f'--windows-icon-from-ico={icon_path}')
 
         # 包含数据目录
-        data_dirs = ['resources']
-        for data_dir in data_dirs:
-            full_path = self.project_root / data_dir
-            if full_path.exists():
-                cmd.append(f'--include-data-dir={full_path}={data_dir}')
+        for full_path in self._resolve_data_dirs():
+            cmd.append(f'--include-data-dir={full_path}={full_path.name}')
 
         # windows版本信息
-        try:
-            from defaults.app_info import AppInfo
-            win_info = AppInfo.get_windows_version_info()
+        win_info = self._win_version_info
+        if win_info is not None:
             cmd.extend([
                 f'--product-name={win_info["product_name"]}',
                 f'--product-version={win_info["product_version"]}',
@@ -590,8 +774,7 @@ exit 0
                 f'--copyright={win_info["legal_copyright"]}',
             ])
             print("🏷️  已添加Windows版本信息")
-        except Exception as e:
-            print(f"⚠️  读取Windows版本信息失败: {e}")
+        else:
             # 使用默认值
             cmd.extend([
                 f'--product-name={self.app_name}',
@@ -630,46 +813,51 @@ exit 0
         print(f"⏳ 构建开始: {start_time.strftime('%H:%M:%S')}")
 
         try:
-            with open(log_file, 'w', encoding='utf-8') as log_f:
-                log_f.write(f"构建命令: {' '.join(cmd)}\n")
-                log_f.write(f"开始时间: {start_time}\n\n")
+            with open(log_file, 'wb', buffering=_LOG_BUFFER_SIZE) as log_f:
+                log_f.write(f"构建命令: {' '.join(cmd)}\n".encode('utf-8'))
+                log_f.write(f"开始时间: {start_time}\n\n".encode('utf-8'))
 
                 process = subprocess.Popen(
                     cmd,
+                    stdin=subprocess.DEVNULL,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
+                    bufsize=0,
                     creationflags=subprocess.CREATE_NO_WINDOW
                 )
 
-                # 简化输出处理
-                last_progress = ""
-                for line in process.stdout:
-                    line = line.rstrip()
-                    log_f.write(line + '\n')
-
-                    # 只显示关键信息
-                    if 'progress:' in line.lower():
-                        # 只显示不同的进度信息
-                        if line != last_progress:
-                            print(f"  {line}")
-                            last_progress = line
-                    elif any(keyword in line.lower() for keyword in ['error:', 'failed:', 'fatal:']):
-                        print(f"  ❌ {line}")
-                    elif any(keyword in line.lower() for keyword in ['done', 'success', 'complete']):
-                        print(f"  ✅ {line}")
-                    elif 'upx' in line.lower() and ('compressing' in line.lower() or 'packed' in line.lower()):
-                        print(f"  📦 {line}")
+                # 原始字节按块读取：整块原样写入日志，只对完整行过滤显示
+                stdout_fd = process.stdout.fileno()
+                last_progress = b""
+                pending: List[bytes] = []
+                while True:
+                    chunk = os.read(stdout_fd, _PIPE_READ_SIZE)
+                    if not chunk:
+                        break
+                    log_f.write(chunk)
+
+                    # 只扫描新读到的块：进度条用 \r 原地刷新，与 \n 一样视为行尾；
+                    # 未结束的行片段暂存在列表中，遇到行尾时才拼接，避免反复复制整个缓冲
+                    *lines, tail = _LINE_SEPARATOR.split(chunk)
+                    if lines:
+                        pending.append(lines[0])
+                        lines[0] = b"".join(pending)
+                        pending.clear()
+                        for raw in lines:
+                            last_progress = self._show_build_line(raw, last_progress)
+                    if tail:
+                        pending.append(tail)
+
+                if pending:
+                    self._show_build_line(b"".join(pending), last_progress)
 
                 process.wait()
                 end_time = datetime.now()
                 elapsed = end_time - start_time
 
-                log_f.write(f"\n结束时间: {end_time}\n")
-                log_f.write(f"耗时: {elapsed.total_seconds():.1f}秒\n")
-                log_f.write(f"退出码: {process.returncode}\n")
+                log_f.write(f"\n结束时间: {end_time}\n".encode('utf-8'))
+                log_f.write(f"耗时: {elapsed.total_seconds():.1f}秒\n".encode('utf-8'))
+                log_f.write(f"退出码: {process.returncode}\n".encode('utf-8'))
 
             print(f"⏱️  构建耗时: {elapsed.total_seconds():.1f}秒")
 
@@ -684,22 +872,58 @@ exit 0
             print(f"❌ 构建异常: {e}")
             return None
 
+    def _show_build_line(self, raw: bytes, last_progress: bytes) -> bytes:
+        """过滤并显示一行构建输出，返回最新的进度行"""
+        # 进度条可能用 \r 原地刷新，拆分后逐条处理
+        for segment in raw.split(b'\r'):
+            segment = segment.rstrip()
+            # 重复的进度行无需再次扫描
+            if not segment or segment == last_progress:
+                continue
+
+            # 只显示关键信息，仅对需要显示的行解码
+            found = {m.lastgroup for m in _BUILD_LINE_PATTERN.finditer(segment)}
+            if not found:
+                continue
+            if 'progress' in found:
+                prefix = "  "
+                last_progress = segment
+            elif 'error' in found:
+                prefix = "  ❌ "
+            elif 'success' in found:
+                prefix = "  ✅ "
+            elif 'upx' in found and 'packing' in found:
+                prefix = "  📦 "
+            else:
+                continue
+
+            print(prefix + segment.decode('utf-8', 'replace'))
+
+        return last_progress
+
     def _locate_output_file(self, output_name: str) -> Optional[Path]:
         """定位生成的输出文件"""
-        # 查找可执行文件
-        exe_path = self.dist_dir / f"main.dist" / f"{output_name}.exe"
+        # 查找可执行文件：main.dist优先，其余为备选（兼容不同版本的Nuitka输出）
+        primary_path = self.dist_dir / f"main.dist" / f"{output_name}.exe"
+        possible_paths = list(dict.fromkeys([
+            primary_path,
+            self.dist_dir / f"{output_name}.dist" / f"{output_name}.exe",
+            self.dist_dir / f"{output_name}.exe",
+        ]))
 
-        if exe_path.exists():
-            # 计算整个main.dist文件夹的大小
-            folder_size = 0
-            for path in exe_path.parent.rglob('*'):
-                if path.is_file():
-                    folder_size += path.stat().st_size
+        for exe_path in possible_paths:
+            try:
+                exe_stat = exe_path.stat()
+            except OSError:
+                continue
+
+            # 计算整个输出文件夹的大小
+            folder_size = _dir_size(exe_path.parent)
 
             size_mb = folder_size / 1024 / 1024
 
             # 显示可执行文件大小
-            exe_size_mb = exe_path.stat().st_size / 1024 / 1024
+            exe_size_mb = exe_stat.st_size / 1024 / 1024
 
             print(f"📦 可执行文件: {exe_path}")
             print(f"📊 文件大小: {exe_size_mb:.2f} MB")
@@ -708,49 +932,22 @@ exit 0
             # ✅ 复制分发文件到输出目录
             self._copy_distribution_files(exe_path.parent)
 
-            # 显示文件夹内容摘要
-            print(f"📂 文件夹内容:")
-            for item in sorted(exe_path.parent.iterdir()):
-                if item.is_file():
-                    item_size = item.stat().st_size / 1024  # KB
-                    print(f"    📄 {item.name} ({item_size:.1f} KB)")
-                elif item.is_dir():
-                    # 计算子文件夹大小
-                    sub_size = sum(f.stat().st_size for f in item.rglob('*') if f.is_file()) / 1024
-                    print(f"    📁 {item.name}/ ({sub_size:.1f} KB)")
+            if exe_path == primary_path:
+                # 显示文件夹内容摘要
+                print(f"📂 文件夹内容:")
+                with os.scandir(exe_path.parent) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+                for entry in entries:
+                    if entry.is_file():
+                        item_size = entry.stat().st_size / 1024  # KB
+                        print(f"    📄 {entry.name} ({item_size:.1f} KB)")
+                    elif entry.is_dir():
+                        # 计算子文件夹大小
+                        sub_size = _dir_size(entry.path) / 1024
+                        print(f"    📁 {entry.name}/ ({sub_size:.1f} KB)")
 
             return exe_path
 
-        # 备选查找（兼容不同版本的Nuitka输出）
-        possible_paths = [
-            self.dist_dir / f"{output_name}.dist" / f"{output_name}.exe",
-            self.dist_dir / f"{output_name}.exe",
-            self.dist_dir / f"{output_name}.dist" / f"{output_name}.exe",
-        ]
-
-        for path in possible_paths:
-            if path.exists():
-                # 计算文件夹大小（如果是.dist文件夹）
-                folder_size = 0
-                folder_path = path.parent
-
-                if folder_path.exists() and folder_path.is_dir():
-                    for item in folder_path.rglob('*'):
-                        if item.is_file():
-                            folder_size += item.stat().st_size
-
-                size_mb = folder_size / 1024 / 1024
-                exe_size_mb = path.stat().st_size / 1024 / 1024
-
-                print(f"📦 可执行文件: {path}")
-                print(f"📊 文件大小: {exe_size_mb:.2f} MB")
-                print(f"📁 文件夹总大小: {size_mb:.2f} MB")
-
-                # ✅ 复制分发文件到输出目录
-                self._copy_distribution_files(path.parent)
-
-                return path
-
         print("⚠️  未找到可执行文件")
         return None
 
@@ -758,17 +955,29 @@ exit 0
         """清理旧的构建文件"""
         print("\n🧹 清理旧构建...")
 
-        patterns = ["build", ".build", "*.dist"]
         cleaned = 0
 
-        for pattern in patterns:
-            for path in self.project_root.rglob(pattern):
-                if path.is_dir():
-                    try:
-                        shutil.rmtree(path, ignore_errors=True)
-                        cleaned += 1
-                    except:
-                        pass
+        # Nuitka只在项目根目录和dist目录下生成构建目录，无需递归整个源码树
+        for parent in (self.project_root, self.dist_dir):
+            try:
+                with os.scandir(parent) as it:
+                    targets = [
+                        entry.path for entry in it
+                        if entry.is_dir(follow_symlinks=False)
+                        and (entry.name in _CLEAN_DIR_NAMES or entry.name.endswith('.dist'))
+                    ]
+            except OSError:
+                continue
+
+            for path in targets:
+                try:
+                    shutil.rmtree(path, ignore_errors=True)
+                    cleaned += 1
+                except:
+                    pass
+
+        # 删除后路径状态已变化，使存在性缓存失效
+        _cached_exists.cache_clear()
 
         if cleaned > 0:
             print(f"✅ 清理完成，删除了 {cleaned} 个目录")
@@ -781,7 +990,7 @@ exit 0
 
         # 检查主文件
         main_file = self.project_root / 'main.py'
-        if not main_file.exists():
+        if not _cached_exists(str(main_file)):
             print(f"❌ 主文件不存在: {main_file}")
             return False
 
@@ -882,16 +1091,17 @@ exit 0
         distribution_files = ['LICENSE', 'THIRD-PARTY-NOTICES.txt', 'README.md',]# 'CHANGELOG.md']
         for filename in distribution_files:
             file_path = self.project_root / filename
-            if file_path.exists():
+            try:
                 file_size = file_path.stat().st_size / 1024
-                print(f"   ✅ {filename} ({file_size:.1f} KB)")
-            else:
+            except OSError:
                 print(f"   ⚠️  {filename} (未找到)")
+            else:
+                print(f"   ✅ {filename} ({file_size:.1f} KB)")
 
         # 主文件检查
         print(f"\n📄 主文件检查:")
         main_file = self.project_root / 'main.py'
-        if main_file.exists():
+        if _cached_exists(str(main_file)):
             analysis = self._analyze_main_file()
             print(f"   ✅ 存在: {main_file}")
             print(f"   框架: {analysis['gui_framework']}")
@@ -912,27 +1122,23 @@ exit 0
 
                 choice = input(f"\n请输入选项 (1-5): ").strip()
 
-                if choice == '1':
-                    self.build(with_console=False)
-                elif choice == '2':
-                    self.build(with_console=True)
-                elif choice == '3':
-                    self.diagnose()
-                elif choice == '4':
-                    self._clean_old_builds()
-                elif choice == '5':
+                if choice == '5':
                     print("👋 再见！")
                     break
-                else:
+
+                action = self._actions.get(choice)
+                if action is None:
                     print("❌ 无效选项")
+                    continue
+
+                action()
 
                 # 询问是否继续
-                if choice in ['1', '2', '3', '4']:
-                    continue_choice = input("\n是否继续? (y/n, 默认y): ").strip().lower()
-                    if continue_choice == 'n':
-                        print("👋 再见！")
-                        break
-                    print("\n" + "="*60)
+                continue_choice = input("\n是否继续? (y/n, 默认y): ").strip().lower()
+                if continue_choice == 'n':
+                    print("👋 再见！")
+                    break
+                print("\n" + "="*60)
 
             except KeyboardInterrupt:
                 print("\n\n🛑 用户中断")
@@ -9,15 +9,23 @@ Description:
 """
 import concurrent.futures
 import fnmatch
+import functools
+import heapq
 import logging
+import re
+import select
 import socket
+import struct
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
+import dns.entropy
+import dns.flags
 import dns.message
-import dns.query
+import dns.rcode
 import dns.rdatatype
 from dns.exception import DNSException, Timeout
 
@@ -25,6 +33,30 @@ from defaults.dns_default import DNSConfig
 
 logger = logging.getLogger(__name__)
 
+# DNS服务端口
+_DNS_PORT = 53
+
+# fnmatch 通配符字符
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+# A记录类型
+_A_TYPE = dns.rdatatype.A
+
+# 每个 (DNS服务器, 出口IP) 最多保留的空闲UDP套接字数
+_UDP_SOCKET_POOL_SIZE = 8
+
+# 缓存分片数（必须为2的幂），各分片独立加锁以减少线程间争用
+_CACHE_SHARDS = 16
+
+# 系统DNS（getaddrinfo）查询线程数
+_SYSTEM_DNS_WORKERS = 16
+
+# 可取消查询检查取消标志的间隔（秒）
+_CANCEL_POLL_INTERVAL = 0.1
+
+# 缓存预刷新的线程数
+_REFRESH_WORKERS = 2
+
 
 class DNSResolver:
     """DNS解析器，支持缓存和并行解析"""
@@ -37,6 +69,7 @@ class DNSResolver:
         self.dns_servers = config.dns_servers
         self.enable_cache = config.enable_cache
         self.default_cache_ttl = config.default_cache_ttl
+        self.refresh_ratio = getattr(config, 'refresh_ratio', 0.8)
         self.cleanup_interval = config.cleanup_interval
         self.max_cache_size = config.max_cache_size
         self.enable_system_dns = config.enable_system_dns
@@ -45,18 +78,45 @@ class DNSResolver:
         self.parallel_timeout = config.parallel_timeout
         self.parallel_workers = config.parallel_workers
 
+        # 只有一个DNS服务器时没有可并行的查询，直接走串行，省去线程池调度
+        if self.resolve_strategy == "parallel" and len(self.dns_servers) <= 1:
+            logger.debug(f"{self.name}: 仅配置了{len(self.dns_servers)}个DNS服务器，使用串行解析")
+            self.resolve_strategy = "serial"
+
         # 解析黑名单
-        self.blacklist_domains = set(config.blacklist_domains)
+        self.blacklist_domains = frozenset(config.blacklist_domains)
         self.blacklist_patterns = config.blacklist_patterns
 
-        # 编译正则表达式
-        self._compiled_patterns = None
+        # 通配符模式：形如 "*.X" / "X.*" 的按域名后缀/前缀放入集合，其余合并为一个正则表达式
+        self._suffix_patterns: frozenset = frozenset()
+        self._prefix_patterns: frozenset = frozenset()
+        self._combined_pattern: Optional[re.Pattern] = None
         if self.blacklist_patterns:
             self._compile_patterns()
 
+        # 黑名单判定结果缓存（实例级，黑名单变化时需调用 cache_clear）
+        self._blacklist_cache = functools.lru_cache(maxsize=4096)(self._is_blacklisted_impl)
+
         # 缓存相关
-        self._cache: Dict[str, Tuple[str, float, float]] = {}  # hostname -> (ip, timestamp, ttl)
-        self._cache_lock = threading.RLock()
+        # 缓存按域名哈希分片，每个分片为 hostname -> (ip, timestamp, ttl)，timestamp 取自 time.monotonic()，
+        # 按访问顺序排列，超出分片容量时淘汰最久未使用的记录
+        self._shards: List["OrderedDict[str, Tuple[str, float, float]]"] = [
+            OrderedDict() for _ in range(_CACHE_SHARDS)
+        ]
+        self._shard_locks = [threading.Lock() for _ in range(_CACHE_SHARDS)]
+        # 每个分片的过期时间小顶堆：(过期时刻, hostname)，清理时只需弹出已到期的部分
+        # 只有清理线程会消费过期堆，未启用自动清理时不维护
+        self._track_expiry = bool(self.enable_cache and self.cleanup_interval)
+        self._expiry_heaps: List[List[Tuple[float, str]]] = [[] for _ in range(_CACHE_SHARDS)]
+        self._shard_max_size = -(-self.max_cache_size // _CACHE_SHARDS) if self.max_cache_size > 0 else 0
+
+        # 进行中的解析：(hostname, egress_ip) -> Future，合并并发的重复查询
+        self._inflight: Dict[Tuple[str, Optional[str]], Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # UDP套接字池：(server, egress_ip) -> 空闲套接字列表
+        self._udp_socks: Dict[Tuple[str, Optional[str]], List[socket.socket]] = {}
+        self._udp_lock = threading.Lock()
 
         # 线程池用于并行解析
         self._executor = ThreadPoolExecutor(
@@ -64,9 +124,24 @@ class DNSResolver:
             thread_name_prefix=f"DNSResolver-Parallel-{self.name}"
         )
 
+        # 系统DNS查询单独使用线程池，以便限时等待且卡住的查询不占用并行解析线程
+        self._system_executor = ThreadPoolExecutor(
+            max_workers=_SYSTEM_DNS_WORKERS,
+            thread_name_prefix=f"DNSResolver-System-{self.name}"
+        )
+
+        # 缓存预刷新单独使用线程池：刷新任务内部还会向上面两个线程池提交查询，共用会互相占满
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=_REFRESH_WORKERS,
+            thread_name_prefix=f"DNSResolver-Refresh-{self.name}"
+        )
+
         # 定期清理线程
         self._cleanup_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # 清理线程计划的下次唤醒时刻；写入更早过期的记录时通过 _cleanup_wakeup 提前唤醒
+        self._next_cleanup_at = float('inf')
+        self._cleanup_wakeup = threading.Event()
 
         self._start_cleanup_thread()
 
@@ -99,14 +174,49 @@ class DNSResolver:
 
         # 检查缓存
         if self.enable_cache:
-            cached_result = self._get_from_cache(hostname)
+            cached_result = self._get_from_cache(hostname, egress_ip)
             if cached_result:
                 logger.info(f"{self.name}: 使用缓存: {hostname} -> {cached_result}")
                 return cached_result
 
+        # 同一域名已有解析在进行时直接等待其结果
+        key = (hostname, egress_ip)
+        with self._inflight_lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                future = Future()
+                self._inflight[key] = future
+
+        if inflight is not None:
+            logger.debug(f"{self.name}: 等待进行中的解析: {hostname}")
+            wait_timeout = timeout or (self.parallel_timeout if self.resolve_strategy == "parallel" else self.serial_timeout)
+            try:
+                return inflight.result(wait_timeout)
+            except (concurrent.futures.TimeoutError, concurrent.futures.CancelledError):
+                # 等待超时或后台刷新在关闭时被取消，自行解析
+                logger.debug(f"{self.name}: 等待进行中的解析未完成，自行解析: {hostname}")
+                return self._resolve_uncached(hostname, egress_ip, timeout)
+
+        try:
+            result = self._resolve_uncached(hostname, egress_ip, timeout)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _resolve_uncached(self,
+                          hostname: str,
+                          egress_ip: Optional[str] = None,
+                          timeout: Optional[int] = None) -> str:
+        """缓存未命中时执行实际解析并写入缓存"""
         if not self.enable_remote_dns_resolve:
             logger.debug(f"禁用远端dns解析")
-            return self._resolve_with_system_mode(hostname)
+            return self._resolve_with_system_mode(hostname, timeout)
 
         # 根据策略选择解析方法
         if self.resolve_strategy == "parallel":
@@ -127,23 +237,16 @@ class DNSResolver:
         """串行解析"""
         timeout_val = timeout or self.serial_timeout
 
-        for server in self.dns_servers:
-            try:
-                logger.debug(f"{self.name}: 使用DNS服务器 {server} 解析: {hostname}")
-
-                result = self._query_dns_server(server, hostname, egress_ip, timeout_val)
-
-                logger.info(f"{self.name}: 串行解析成功 [{server}]: {hostname} -> {result}")
-                return result
+        try:
+            answer = self._query_servers_staggered(hostname, egress_ip, timeout_val)
+        except Exception as e:
+            logger.warning(f"{self.name}: 串行解析未知错误: {e}")
+            answer = None
 
-            except (socket.timeout, Timeout):
-                logger.debug(f"{self.name}: {server} 查询超时")
-            except DNSException as e:
-                logger.debug(f"{self.name}: {server} DNS协议错误: {e}")
-            except OSError as e:
-                logger.debug(f"{self.name}: {server} 网络错误: {e}")
-            except Exception as e:
-                logger.warning(f"{self.name}: {server} 未知错误: {e}")
+        if answer:
+            server, result = answer
+            logger.info(f"{self.name}: 串行解析成功 [{server}]: {hostname} -> {result}")
+            return result
 
         # 尝试过期缓存
         if self.enable_cache:
@@ -156,7 +259,7 @@ class DNSResolver:
         if self.enable_system_dns:
             try:
                 logger.debug(f"{self.name}: 尝试系统DNS解析: {hostname}")
-                result = socket.getaddrinfo(hostname, None, family=socket.AF_INET)
+                result = self._getaddrinfo_with_timeout(hostname, timeout_val)
                 if result:
                     ip = result[0][4][0]
                     logger.debug(f"{self.name}: 系统DNS解析成功: {hostname} -> {ip}")
@@ -175,40 +278,44 @@ class DNSResolver:
                          egress_ip: Optional[str] = None,
                          timeout: Optional[int] = None) -> str:
         """并行解析"""
+        # 单个服务器无需提交到线程池
+        if len(self.dns_servers) <= 1:
+            return self._resolve_serial(hostname, egress_ip, timeout)
+
         timeout_val = timeout or self.parallel_timeout
 
-        # 准备并行查询任务
+        # 查询报文只构造一次，各服务器发送前再写入各自的随机ID
+        query = dns.message.make_query(hostname, _A_TYPE)
+        wire = query.to_wire()
+
+        # 准备并行查询任务（取得结果后通过取消标志让其余查询尽快退出并释放线程）
+        cancel_event = threading.Event()
         futures = {}
         for server in self.dns_servers:
             future = self._executor.submit(
                 self._query_dns_server,
-                server, hostname, egress_ip, timeout_val
+                server, query, wire, egress_ip, timeout_val, cancel_event
             )
             futures[future] = server
 
-        # 等待第一个成功的结果
+        # 按完成顺序等待第一个成功的结果
         try:
-            done, not_done = concurrent.futures.wait(
-                futures.keys(),
-                timeout=timeout_val,
-                return_when=concurrent.futures.FIRST_COMPLETED
-            )
-
-            # 检查已完成的任务
-            for future in done:
+            for future in concurrent.futures.as_completed(futures, timeout=timeout_val):
                 if future.exception() is None:
                     result = future.result()
                     if result:
                         server = futures[future]
                         logger.info(f"{self.name}: 并行解析成功 [{server}]: {hostname} -> {result}")
-
-                        for unfinished_future in not_done:
-                            unfinished_future.cancel()
-
                         return result
 
+        except concurrent.futures.TimeoutError:
+            logger.debug(f"{self.name}: 并行解析超时: {hostname}")
         except Exception as e:
             logger.error(f"{self.name}: 并行解析异常: {e}")
+        finally:
+            cancel_event.set()
+            for future in futures:
+                future.cancel()
 
         # 并行解析失败，降级到串行
         logger.debug(f"{self.name}: 并行解析失败，尝试串行解析")
@@ -216,36 +323,242 @@ class DNSResolver:
 
     def _query_dns_server(self,
                          server: str,
-                         hostname: str,
+                         query: dns.message.Message,
+                         wire: bytes,
                          egress_ip: Optional[str] = None,
-                         timeout: int = 5) -> str:
-        """查询单个DNS服务器"""
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
-            sock.settimeout(timeout)
+                         timeout: int = 5,
+                         cancel_event: Optional[threading.Event] = None) -> str:
+        """查询单个DNS服务器（cancel_event被设置时提前放弃查询）"""
+        sock = self._acquire_udp_socket(server, egress_ip)
+        try:
+            response = self._exchange_udp(sock, query, wire, timeout, cancel_event)
+        except BaseException:
+            # 超时或出错的套接字状态不确定，直接关闭，下次重新创建
+            sock.close()
+            raise
+
+        self._release_udp_socket(server, egress_ip, sock)
+        return self._extract_a_record(response)
+
+    @staticmethod
+    def _stamp_query_id(wire: bytes) -> Tuple[bytes, int]:
+        """复制查询报文并写入新的随机ID"""
+        query_id = dns.entropy.random_16()
+        buf = bytearray(wire)
+        struct.pack_into('>H', buf, 0, query_id)
+        return bytes(buf), query_id
+
+    @staticmethod
+    def _is_response_to(query: dns.message.Message, query_id: int, response: dns.message.Message) -> bool:
+        """判断响应是否对应以 query_id 发出的查询（同 Message.is_response，但ID按实际发送的比对）"""
+        if response.id != query_id or not response.flags & dns.flags.QR:
+            return False
+        # 部分错误响应不带问题段
+        if not response.question and response.rcode() != dns.rcode.NOERROR:
+            return True
+        return response.question == query.question
 
-            if egress_ip:
-                sock.bind((egress_ip, 0))
+    @staticmethod
+    def _extract_a_record(response: dns.message.Message) -> str:
+        """从响应中取出第一条A记录的地址"""
+        if response.rcode() != 0:
+            raise DNSException(f"DNS错误码: {response.rcode()}")
+
+        # 查找A记录
+        for answer in response.answer:
+            if answer.rdtype == _A_TYPE:
+                for item in answer:
+                    address = getattr(item, 'address', None)
+                    if address:
+                        return str(address)
+
+        raise DNSException("未找到A记录")
+
+    def _query_servers_staggered(self,
+                                 hostname: str,
+                                 egress_ip: Optional[str],
+                                 timeout: float) -> Optional[Tuple[str, str]]:
+        """按顺序错开向各DNS服务器发送查询，在同一个select中等待响应
+
+        先查询第一个服务器；在 timeout/N 内没有响应或该服务器失败时再追加查询下一个，
+        已发出的查询继续等待。总耗时不超过一个 timeout，而不是逐个超时叠加。
+
+        Returns:
+            (server, ip)，全部失败或超时时返回None
+        """
+        # 查询报文只构造一次，各服务器发送前再写入各自的随机ID
+        query = dns.message.make_query(hostname, _A_TYPE)
+        wire = query.to_wire()
+
+        pending = list(self.dns_servers)
+        stagger = timeout / max(len(pending), 1)
+        deadline = time.monotonic() + timeout
+        next_start = 0.0
+        active: Dict[socket.socket, str] = {}
+        query_ids: Dict[socket.socket, int] = {}
+
+        try:
+            while True:
+                now = time.monotonic()
+
+                # 到达错开时间或当前没有进行中的查询时，启动下一个服务器
+                if pending and (not active or now >= next_start):
+                    server = pending.pop(0)
+                    logger.debug(f"{self.name}: 使用DNS服务器 {server} 解析: {hostname}")
+                    try:
+                        sock = self._acquire_udp_socket(server, egress_ip)
+                    except OSError as e:
+                        logger.debug(f"{self.name}: {server} 网络错误: {e}")
+                        continue
+                    server_wire, query_ids[sock] = self._stamp_query_id(wire)
+                    try:
+                        sock.send(server_wire)
+                    except OSError as e:
+                        sock.close()
+                        logger.debug(f"{self.name}: {server} 网络错误: {e}")
+                        continue
+                    active[sock] = server
+                    next_start = now + stagger
+                    continue
+
+                remaining = deadline - now
+                if not active or remaining <= 0:
+                    for server in active.values():
+                        logger.debug(f"{self.name}: {server} 查询超时")
+                    return None
+
+                wait = min(remaining, next_start - now) if pending else remaining
+                readable, _, _ = select.select(list(active), [], [], max(wait, 0))
+
+                # 同时就绪时优先采用排在前面的服务器
+                for sock in sorted(readable, key=lambda s: self.dns_servers.index(active[s])):
+                    server = active.pop(sock)
+                    try:
+                        response = dns.message.from_wire(sock.recv(65535))
+                    except OSError as e:
+                        sock.close()
+                        logger.debug(f"{self.name}: {server} 网络错误: {e}")
+                        # 该服务器已失败，立即启动下一个
+                        next_start = 0.0
+                        continue
+                    except Exception:
+                        # 无法解析的残留报文，继续等待真正的响应
+                        active[sock] = server
+                        continue
+
+                    if not self._is_response_to(query, query_ids[sock], response):
+                        active[sock] = server
+                        continue
+
+                    self._release_udp_socket(server, egress_ip, sock)
+                    try:
+                        return server, self._extract_a_record(response)
+                    except DNSException as e:
+                        logger.debug(f"{self.name}: {server} DNS协议错误: {e}")
+                        # 该服务器已失败，立即启动下一个
+                        next_start = 0.0
+        finally:
+            # 未完成查询的套接字可能还会收到迟到的响应，直接关闭
+            for sock in active:
+                sock.close()
+
+    def _exchange_udp(self,
+                      sock: socket.socket,
+                      query: dns.message.Message,
+                      wire: bytes,
+                      timeout: float,
+                      cancel_event: Optional[threading.Event] = None) -> dns.message.Message:
+        """通过已连接的UDP套接字发送预先编码的查询报文并等待响应
+
+        发送前写入新的随机ID；复用的套接字上可能残留迟到的旧响应，忽略不匹配的报文。
+        提供 cancel_event 时分段等待，每段之间检查取消标志。
+        """
+        wire, query_id = self._stamp_query_id(wire)
+        deadline = time.monotonic() + timeout
+        # 套接字已connect到服务器，不再传目标地址（内核只投递来自该服务器的报文）
+        sock.send(wire)
 
-            query = dns.message.make_query(hostname, dns.rdatatype.A)
-            response = dns.query.udp(query, server, timeout=timeout, sock=sock)
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise DNSException("查询已取消")
 
-            if response.rcode() != 0:
-                raise DNSException(f"DNS错误码: {response.rcode()}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise Timeout(timeout=timeout)
+            if cancel_event is not None:
+                remaining = min(remaining, _CANCEL_POLL_INTERVAL)
 
-            # 查找A记录
-            for answer in response.answer:
-                if answer.rdtype == dns.rdatatype.A:
-                    for item in answer:
-                        if hasattr(item, 'address'):
-                            ip_address = str(item.address)
-                            return ip_address
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                continue
 
-            raise DNSException("未找到A记录")
+            try:
+                response = dns.message.from_wire(sock.recv(65535))
+            except OSError:
+                raise
+            except Exception:
+                # 无法解析的残留报文，继续等待
+                continue
+
+            if self._is_response_to(query, query_id, response):
+                return response
+
+    def _acquire_udp_socket(self, server: str, egress_ip: Optional[str]) -> socket.socket:
+        """从池中取出空闲UDP套接字，没有时新建（绑定出口IP并connect到服务器）"""
+        with self._udp_lock:
+            idle = self._udp_socks.get((server, egress_ip))
+            if idle:
+                return idle.pop()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            if egress_ip:
+                sock.bind((egress_ip, 0))
+            sock.connect((server, _DNS_PORT))
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def _release_udp_socket(self, server: str, egress_ip: Optional[str], sock: socket.socket):
+        """归还UDP套接字，池已满或解析器已关闭时直接关闭"""
+        with self._udp_lock:
+            if not self._stop_event.is_set():
+                idle = self._udp_socks.setdefault((server, egress_ip), [])
+                if len(idle) < _UDP_SOCKET_POOL_SIZE:
+                    idle.append(sock)
+                    return
+        sock.close()
+
+    def _close_udp_sockets(self):
+        """关闭池中所有空闲UDP套接字"""
+        with self._udp_lock:
+            pools = list(self._udp_socks.values())
+            self._udp_socks.clear()
+
+        for idle in pools:
+            for sock in idle:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+
+    def _getaddrinfo_with_timeout(self, hostname: str, timeout: float):
+        """在线程池中执行系统DNS查询并限时等待
+
+        getaddrinfo 本身无法中断，超时后查询线程仍会继续运行直到系统解析器返回。
+        """
+        future = self._system_executor.submit(socket.getaddrinfo, hostname, None, socket.AF_INET)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise RuntimeError(f"系统DNS解析超时（{timeout}秒）")
 
-    def _resolve_with_system_mode(self, hostname:str) -> str:
+    def _resolve_with_system_mode(self, hostname: str, timeout: Optional[int] = None) -> str:
         try:
             logger.debug(f"{self.name}: 使用系统DNS解析: {hostname}")
-            result = socket.getaddrinfo(hostname, None, family=socket.AF_INET)
+            result = self._getaddrinfo_with_timeout(hostname, timeout or self.serial_timeout)
             if result:
                 hostname_ip = result[0][4][0]
                 logger.info(f"{self.name}: 系统DNS解析成功: {hostname} -> {hostname_ip}")
@@ -259,86 +572,208 @@ class DNSResolver:
     # ==================== 黑名单检查 ====================
 
     def _compile_patterns(self):
-        """预编译通配符模式为正则表达式"""
-        import re
-        compiled = []
+        """预编译通配符模式
+
+        "*.X" 等价于以 ".X" 结尾、"X.*" 等价于以 "X." 开头（X 不含通配符），
+        这两类分别放入后缀/前缀集合，按域名中每个 "." 的位置查集合即可，耗时与模式数量无关；
+        其余模式合并为单个正则表达式（各模式以分支合并，一次匹配完成）。
+        """
+        suffixes = set()
+        prefixes = set()
+        general = []
         for pattern in self.blacklist_patterns:
-            regex_pattern = fnmatch.translate(pattern)
-            compiled.append(re.compile(regex_pattern))
-        self._compiled_patterns = compiled
+            if pattern.startswith("*.") and not _GLOB_CHARS.search(pattern, 2):
+                suffixes.add(pattern[2:])
+            elif pattern.endswith(".*") and not _GLOB_CHARS.search(pattern, 0, len(pattern) - 2):
+                prefixes.add(pattern[:-2])
+            else:
+                general.append(pattern)
+
+        self._suffix_patterns = frozenset(suffixes)
+        self._prefix_patterns = frozenset(prefixes)
+        if general:
+            combined = "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in general)
+            self._combined_pattern = re.compile(combined)
 
     def _is_blacklisted(self, hostname: str) -> bool:
+        """检查域名是否在黑名单中（重复的域名直接使用缓存的判定结果）"""
+        return self._blacklist_cache(hostname)
+
+    def _is_blacklisted_impl(self, hostname: str) -> bool:
         """检查域名是否在黑名单中"""
         if hostname in self.blacklist_domains:
             logger.debug(f"{self.name}: 精确匹配黑名单: {hostname}")
             return True
 
-        if self._compiled_patterns:
-            for pattern_regex in self._compiled_patterns:
-                if pattern_regex.match(hostname):
+        if self._suffix_patterns or self._prefix_patterns:
+            dot = hostname.find(".")
+            while dot != -1:
+                if hostname[dot + 1:] in self._suffix_patterns or hostname[:dot] in self._prefix_patterns:
                     logger.debug(f"{self.name}: 通配符匹配: {hostname}")
                     return True
+                dot = hostname.find(".", dot + 1)
+
+        if self._combined_pattern and self._combined_pattern.match(hostname):
+            logger.debug(f"{self.name}: 通配符匹配: {hostname}")
+            return True
 
         return False
 
     # ==================== 缓存管理 ====================
 
+    def _shard(self, hostname: str) -> Tuple["OrderedDict[str, Tuple[str, float, float]]", threading.Lock]:
+        """返回域名所在的缓存分片及其锁"""
+        index = self._shard_index(hostname)
+        return self._shards[index], self._shard_locks[index]
+
+    @staticmethod
+    def _shard_index(hostname: str) -> int:
+        """域名所在的分片序号"""
+        return hash(hostname) & (_CACHE_SHARDS - 1)
+
     def _add_to_cache(self, hostname: str, ip: str, ttl: Optional[int] = None):
         """添加记录到缓存"""
-        with self._cache_lock:
-            cache_ttl = ttl if ttl is not None else self.default_cache_ttl
-            self._cache[hostname] = (ip, time.time(), cache_ttl)
-
-    def _get_from_cache(self, hostname: str) -> Optional[str]:
-        """从缓存获取未过期的记录"""
-        with self._cache_lock:
-            if hostname not in self._cache:
+        index = self._shard_index(hostname)
+        cache, lock = self._shards[index], self._shard_locks[index]
+        cache_ttl = ttl if ttl is not None else self.default_cache_ttl
+        timestamp = time.monotonic()
+        deadline = timestamp + cache_ttl
+        with lock:
+            cache[hostname] = (ip, timestamp, cache_ttl)
+            cache.move_to_end(hostname)
+
+            if self._shard_max_size > 0:
+                while len(cache) > self._shard_max_size:
+                    cache.popitem(last=False)
+
+            if not self._track_expiry:
+                return
+
+            heap = self._expiry_heaps[index]
+            heapq.heappush(heap, (deadline, hostname))
+            self._prune_expiry_heap(cache, heap)
+
+        if deadline < self._next_cleanup_at:
+            self._cleanup_wakeup.set()
+
+    @staticmethod
+    def _prune_expiry_heap(cache: "OrderedDict[str, Tuple[str, float, float]]", heap: List[Tuple[float, str]]):
+        """
+        清理过期堆中已失效的条目，调用方需持有分片锁
+
+        记录被覆盖或被LRU淘汰后，其旧的堆条目会残留：先弹出失效的堆顶，
+        堆长度仍超过缓存记录数两倍时按当前缓存重建
+        """
+        while heap:
+            deadline, hostname = heap[0]
+            entry = cache.get(hostname)
+            if entry and entry[1] + entry[2] == deadline:
+                break
+            heapq.heappop(heap)
+
+        if len(heap) > 2 * len(cache):
+            heap[:] = [(timestamp + ttl, hostname) for hostname, (_, timestamp, ttl) in cache.items()]
+            heapq.heapify(heap)
+
+    def _get_from_cache(self, hostname: str, egress_ip: Optional[str] = None) -> Optional[str]:
+        """从缓存获取未过期的记录，记录临近过期时在后台提前刷新"""
+        cache, lock = self._shard(hostname)
+        now = time.monotonic()
+        with lock:
+            if hostname not in cache:
                 return None
 
-            ip, timestamp, ttl = self._cache[hostname]
-            if time.time() - timestamp <= ttl:
-                return ip
-            else:
+            ip, timestamp, ttl = cache[hostname]
+            age = now - timestamp
+            if age > ttl:
                 return None
+            cache.move_to_end(hostname)
+
+        if 0 < self.refresh_ratio < 1 and age > ttl * self.refresh_ratio:
+            self._schedule_refresh(hostname, egress_ip)
+        return ip
+
+    def _schedule_refresh(self, hostname: str, egress_ip: Optional[str]):
+        """提交后台刷新，复用进行中解析表去重；刷新期间记录过期的请求会直接等待刷新结果"""
+        if self._stop_event.is_set():
+            return
+
+        key = (hostname, egress_ip)
+        with self._inflight_lock:
+            if key in self._inflight:
+                return
+            future = Future()
+            self._inflight[key] = future
+
+        try:
+            self._refresh_executor.submit(self._refresh_entry, hostname, egress_ip, future)
+        except RuntimeError:
+            # 解析器正在关闭
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            future.cancel()
+
+    def _refresh_entry(self, hostname: str, egress_ip: Optional[str], future: Future):
+        """后台重新解析域名，结果经 _resolve_uncached 写回缓存并刷新TTL"""
+        try:
+            result = self._resolve_uncached(hostname, egress_ip)
+        except BaseException as e:
+            future.set_exception(e)
+            logger.debug(f"{self.name}: 缓存预刷新失败: {hostname}, {e}")
+        else:
+            future.set_result(result)
+            logger.debug(f"{self.name}: 缓存预刷新: {hostname} -> {result}")
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop((hostname, egress_ip), None)
 
     def _get_expired_from_cache(self, hostname: str) -> Optional[str]:
         """获取过期的缓存记录"""
-        with self._cache_lock:
-            if hostname in self._cache:
-                ip, timestamp, ttl = self._cache[hostname]
+        cache, lock = self._shard(hostname)
+        with lock:
+            if hostname in cache:
+                ip, timestamp, ttl = cache[hostname]
                 return ip
             return None
 
     def clear_cache(self, hostname: Optional[str] = None):
         """清理缓存"""
-        with self._cache_lock:
-            if hostname:
-                if hostname in self._cache:
-                    del self._cache[hostname]
+        if hostname:
+            cache, lock = self._shard(hostname)
+            with lock:
+                if hostname in cache:
+                    del cache[hostname]
                     logger.debug(f"{self.name}: 已清除缓存: {hostname}")
-            else:
-                count = len(self._cache)
-                self._cache.clear()
-                logger.debug(f"{self.name}: 已清除所有缓存，共{count}条记录")
+        else:
+            count = 0
+            for cache, lock, heap in zip(self._shards, self._shard_locks, self._expiry_heaps):
+                with lock:
+                    count += len(cache)
+                    cache.clear()
+                    heap.clear()
+            logger.debug(f"{self.name}: 已清除所有缓存，共{count}条记录")
 
     def get_cache_info(self) -> Dict:
         """获取缓存信息"""
-        with self._cache_lock:
-            now = time.time()
-            valid = 0
-            expired = 0
-
-            for ip, timestamp, ttl in self._cache.values():
-                if now - timestamp <= ttl:
-                    valid += 1
-                else:
-                    expired += 1
-
-            return {
-                'total': len(self._cache),
-                'valid': valid,
-                'expired': expired
-            }
+        now = time.monotonic()
+        total = 0
+        valid = 0
+        expired = 0
+
+        for cache, lock in zip(self._shards, self._shard_locks):
+            with lock:
+                total += len(cache)
+                for ip, timestamp, ttl in cache.values():
+                    if now - timestamp <= ttl:
+                        valid += 1
+                    else:
+                        expired += 1
+
+        return {
+            'total': total,
+            'valid': valid,
+            'expired': expired
+        }
 
     # ==================== 后台清理线程 ====================
 
@@ -354,59 +789,83 @@ class DNSResolver:
             logger.debug(f"{self.name}: 启动缓存清理线程")
 
     def _cleanup_worker(self):
-        """缓存清理工作线程"""
-        while not self._stop_event.wait(self.cleanup_interval):
+        """缓存清理工作线程
+
+        按最早过期记录的时刻休眠（两次清理至少间隔 cleanup_interval），
+        缓存为空时一直休眠，直到写入新记录时被唤醒。
+        """
+        last_cleanup = time.monotonic()
+        while not self._stop_event.is_set():
+            earliest = self._earliest_expiry()
+            if earliest is None:
+                self._next_cleanup_at = float('inf')
+                delay = None
+            else:
+                self._next_cleanup_at = max(earliest, last_cleanup + self.cleanup_interval)
+                delay = self._next_cleanup_at - time.monotonic()
+
+            if delay is None or delay > 0:
+                self._cleanup_wakeup.wait(delay)
+                self._cleanup_wakeup.clear()
+                continue
+
             try:
                 self._perform_cache_cleanup()
             except Exception as e:
                 logger.error(f"{self.name}: 缓存清理异常: {e}")
+            last_cleanup = time.monotonic()
+
+    def _earliest_expiry(self) -> Optional[float]:
+        """所有分片中最早的过期时刻，缓存为空时返回None"""
+        earliest = None
+        for lock, heap in zip(self._shard_locks, self._expiry_heaps):
+            with lock:
+                if heap and (earliest is None or heap[0][0] < earliest):
+                    earliest = heap[0][0]
+        return earliest
 
     def _perform_cache_cleanup(self):
-        """执行缓存清理"""
-        with self._cache_lock:
-            now = time.time()
-            expired_count = 0
-            oversized_count = 0
-
-            # 清理过期缓存
-            expired_hostnames = []
-            for hostname, (ip, timestamp, ttl) in self._cache.items():
-                if now - timestamp > ttl:
-                    expired_hostnames.append(hostname)
-
-            for hostname in expired_hostnames:
-                del self._cache[hostname]
-                expired_count += 1
-
-            # 清理超出大小的缓存
-            if self.max_cache_size > 0 and len(self._cache) > self.max_cache_size:
-                sorted_items = sorted(
-                    self._cache.items(),
-                    key=lambda x: x[1][1]
-                )
-                remove_count = len(self._cache) - self.max_cache_size
-                for i in range(remove_count):
-                    hostname, _ = sorted_items[i]
-                    del self._cache[hostname]
-                    oversized_count += 1
-
-            if expired_count > 0 or oversized_count > 0:
-                logger.debug(
-                    f"{self.name}: 缓存清理 - "
-                    f"过期: {expired_count}, 超限: {oversized_count}, "
-                    f"剩余: {len(self._cache)}"
-                )
+        """执行缓存清理（逐个分片加锁，不阻塞其它分片的查询）"""
+        now = time.monotonic()
+        expired_count = 0
+        remaining = 0
+
+        for cache, lock, heap in zip(self._shards, self._shard_locks, self._expiry_heaps):
+            with lock:
+                # 只弹出已到期的堆顶记录；记录已被覆盖或淘汰时过期时刻对不上，直接跳过
+                while heap and heap[0][0] < now:
+                    deadline, hostname = heapq.heappop(heap)
+                    entry = cache.get(hostname)
+                    if entry and entry[1] + entry[2] == deadline:
+                        del cache[hostname]
+                        expired_count += 1
+
+                remaining += len(cache)
+
+        # 缓存容量在写入时已按LRU限制，这里只需清理过期记录
+        if expired_count > 0:
+            logger.debug(
+                f"{self.name}: 缓存清理 - "
+                f"过期: {expired_count}, "
+                f"剩余: {remaining}"
+            )
 
     def shutdown(self):
         """关闭解析器，清理资源"""
         self._stop_event.set()
+        self._cleanup_wakeup.set()
 
         # 等待清理线程结束
         if self._cleanup_thread and self._cleanup_thread.is_alive():
             self._cleanup_thread.join(timeout=5)
 
-        # 关闭线程池
+        # 关闭线程池（系统DNS查询可能卡在getaddrinfo中，不等待）
+        self._refresh_executor.shutdown(wait=False)
         self._executor.shutdown(wait=True)
+        self._system_executor.shutdown(wait=False, cancel_futures=True)
+
+        # 关闭复用的UDP套接字
+        self._close_udp_sockets()
 
         # 清理缓存
         self.clear_cache()
@@ -9,7 +9,9 @@ Description:
 """
 
 
+import itertools
 import logging
+import threading
 
 from .proxy_worker import ProxyWorker
 from .dns_resolver import DNSResolver
@@ -36,6 +38,19 @@ class ProxyManager:
         self.proxy_workers = {}
         self.signals = signals
 
+        # 按类型分组的工作器，批量操作时按 SOCKS5 -> HTTP 的顺序遍历
+        self._socks5_workers = {}
+        self._http_workers = {}
+
+        # 运行/认证/安全管理的代理数量，由工作器状态变化回调维护
+        self._running_count = 0
+        self._auth_count = 0
+        self._security_count = 0
+        self._count_lock = threading.Lock()
+
+        # 状态变化信号的延迟发送定时器，200ms内的多次操作合并为一次发送
+        self._status_timer = None
+
     def setup_proxies(self, socks5_proxy_config, http_proxy_config):
         """设置代理工作器"""
         try:
@@ -66,12 +81,13 @@ class ProxyManager:
                     self.dns_resolver,
                     self.context,
                     kind='socks5',
+                    state_listener=self._on_worker_state_changed,
                 )
-                self.proxy_workers[config_id] = worker
+                self._register_worker(config_id, worker)
 
                 # 记录接口认证状态
                 auth_status = "认证" if worker.get_auth_status() else "无认证"
-                logger.debug(f"创建 SOCKS5 代理: {interface.iface_name} {interface.ip}:{interface.port} ({auth_status})")
+                logger.debug("创建 SOCKS5 代理: %s (%s)", worker.address_label, auth_status)
 
             for i, interface in enumerate(http_list):
                 config_id = f"http_{i}"
@@ -83,12 +99,13 @@ class ProxyManager:
                     self.dns_resolver,
                     self.context,
                     kind='http',
+                    state_listener=self._on_worker_state_changed,
                 )
-                self.proxy_workers[config_id] = worker
+                self._register_worker(config_id, worker)
 
                 # 记录接口认证状态
                 auth_status = "认证" if worker.get_auth_status() else "无认证"
-                logger.debug(f"创建 HTTP 代理: {interface.iface_name} {interface.ip}:{interface.port} ({auth_status})")
+                logger.debug("创建 HTTP 代理: %s (%s)", worker.address_label, auth_status)
 
             return True
 
@@ -97,36 +114,67 @@ class ProxyManager:
             raise
 
 
+    def _register_worker(self, config_id, worker):
+        """登记工作器并计入计数，替换同名工作器时扣除旧工作器的计数"""
+        old_worker = self.proxy_workers.get(config_id)
+        if old_worker is not None:
+            old_worker.state_listener = None
+            self._adjust_counts(old_worker, -1)
+        self.proxy_workers[config_id] = worker
+        if worker.kind == 'http':
+            self._http_workers[config_id] = worker
+        else:
+            self._socks5_workers[config_id] = worker
+        self._adjust_counts(worker, 1)
+
+    def _ordered_workers(self):
+        """先SOCKS5后HTTP依次遍历所有工作器"""
+        return itertools.chain(self._socks5_workers.items(), self._http_workers.items())
+
+    def _adjust_counts(self, worker, sign):
+        """按工作器当前状态增减计数"""
+        with self._count_lock:
+            self._running_count += sign * (worker.status == "running")
+            self._auth_count += sign * bool(worker.get_auth_status())
+            self._security_count += sign * bool(worker.get_security_status())
+
+    def _on_worker_state_changed(self, name, old, new):
+        """工作器状态变化回调（可能在代理线程中调用）"""
+        with self._count_lock:
+            if name == 'status':
+                self._running_count += (new == "running") - (old == "running")
+            elif name == 'auth_enabled':
+                self._auth_count += bool(new) - bool(old)
+            elif name == 'security_enabled':
+                self._security_count += bool(new) - bool(old)
+
+    def _schedule_status_emit(self):
+        """200ms后发送 proxy_status_changed，已有待发送的信号时不重复安排"""
+        if self._status_timer is None:
+            self._status_timer = QTimer()
+            self._status_timer.setSingleShot(True)
+            self._status_timer.timeout.connect(self.signals.proxy_status_changed.emit)
+        if not self._status_timer.isActive():
+            self._status_timer.start(200)
+
     def start_all_proxies(self):
         """启动所有代理"""
         logger.info("正在一键启动所有代理...")
-        http_proxy = {}
         start_count = 0
 
-        for config_id, worker in self.proxy_workers.items():
-            if config_id.startswith("http"):
-                http_proxy[config_id] = worker
-                continue
-
+        for config_id, worker in self._ordered_workers():
             if worker.status in ["stopped", "error"]:
                 worker.start()
                 start_count += 1
                 auth_status = "认证" if worker.get_auth_status() else "无认证"
-                logger.info(f"启动代理: {config_id}: {worker.interface.iface_name} {worker.interface.ip}:{worker.interface.port} ({auth_status})")
-
-        for config_id, worker in http_proxy.items():
-            if worker.status in ["stopped", "error"]:
-                worker.start()
-                start_count += 1
-                auth_status = "认证" if worker.get_auth_status() else "无认证"
-                logger.info(f"启动代理: {config_id}: {worker.interface.iface_name} {worker.interface.ip}:{worker.interface.port} ({auth_status})")
+                logger.info("启动代理: %s: %s (%s)", config_id, worker.address_label, auth_status)
 
         if start_count > 0:
             logger.info(f"已启动 {start_count} 个代理")
         else:
             logger.info("没有需要启动的代理")
 
-        QTimer.singleShot(200, lambda: self.signals.proxy_status_changed.emit())
+        self._schedule_status_emit()
         return start_count
 
     def stop_all_proxies(self):
@@ -138,33 +186,22 @@ class ProxyManager:
             if worker.status in ["running", "starting"]:
                 worker.stop()
                 stop_count += 1
-                logger.info(f"停止代理: {config_id}: {worker.interface.iface_name} {worker.interface.ip}:{worker.interface.port}")
+                logger.info("停止代理: %s: %s", config_id, worker.address_label)
 
         if stop_count > 0:
             logger.info(f"已停止 {stop_count} 个代理")
         else:
             logger.info("没有正在运行的代理")
 
-        QTimer.singleShot(200, lambda: self.signals.proxy_status_changed.emit())
+        self._schedule_status_emit()
         return stop_count
 
     def restart_all_proxies(self):
         """重启所有代理"""
         logger.info("正在一键重启所有代理...")
-        http_proxy = {}
         restart_count = 0
 
-        for config_id, worker in self.proxy_workers.items():
-            if config_id.startswith("http"):
-                http_proxy[config_id] = worker
-                continue
-
-            if worker.status in ["running", "error"]:
-                worker.restart()
-                restart_count += 1
-                logger.info(f"重启代理: {config_id}")
-
-        for config_id, worker in http_proxy.items():
+        for config_id, worker in self._ordered_workers():
             if worker.status in ["running", "error"]:
                 worker.restart()
                 restart_count += 1
@@ -174,7 +211,7 @@ class ProxyManager:
             logger.info(f"已重启 {restart_count} 个代理")
         else:
             logger.info("没有需要重启的代理")
-        QTimer.singleShot(200, lambda: self.signals.proxy_status_changed.emit())
+        self._schedule_status_emit()
         return restart_count
 
     def start_proxy(self, config_id):
@@ -182,8 +219,8 @@ class ProxyManager:
         if config_id in self.proxy_workers:
             self.proxy_workers[config_id].start()
             worker = self.proxy_workers[config_id]
-            logger.info(f"启动代理: {config_id}: {worker.interface.iface_name} {worker.interface.ip}:{worker.interface.port}")
-            QTimer.singleShot(200, lambda: self.signals.proxy_status_changed.emit())
+            logger.info("启动代理: %s: %s", config_id, worker.address_label)
+            self._schedule_status_emit()
             return True
         return False
 
@@ -192,8 +229,8 @@ class ProxyManager:
         if config_id in self.proxy_workers:
             self.proxy_workers[config_id].stop()
             worker = self.proxy_workers[config_id]
-            logger.info(f"停止代理: {config_id}: {worker.interface.iface_name} {worker.interface.ip}:{worker.interface.port}")
-            QTimer.singleShot(200, lambda: self.signals.proxy_status_changed.emit())
+            logger.info("停止代理: %s: %s", config_id, worker.address_label)
+            self._schedule_status_emit()
             return True
         return False
 
@@ -202,8 +239,8 @@ class ProxyManager:
         if config_id in self.proxy_workers:
             self.proxy_workers[config_id].restart()
             worker = self.proxy_workers[config_id]
-            logger.info(f"重启代理: {config_id}: {worker.interface.iface_name} {worker.interface.ip}:{worker.interface.port}")
-            QTimer.singleShot(200, lambda: self.signals.proxy_status_changed.emit())
+            logger.info("重启代理: %s: %s", config_id, worker.address_label)
+            self._schedule_status_emit()
             return True
         return False
 
@@ -216,24 +253,21 @@ class ProxyManager:
 
             # 重启代理以应用新的认证设置
             worker.restart()
-            logger.info(f"接口 {config_id}: {worker.interface.iface_name} {worker.interface.ip}:{worker.interface.port}认证已{status_text}，正在重启...")
+            logger.info("接口 %s: %s认证已%s，正在重启...", config_id, worker.address_label, status_text)
             return True
         return False
 
     def get_running_count(self):
         """获取运行中的代理数量"""
-        return sum(1 for worker in self.proxy_workers.values()
-                  if worker.status == "running")
+        return self._running_count
 
     def get_auth_count(self):
         """获取启用认证的代理数量"""
-        return sum(1 for worker in self.proxy_workers.values()
-                  if worker.get_auth_status())
+        return self._auth_count
 
     def get_security_count(self):
         """获取启用认证的代理数量"""
-        return sum(1 for worker in self.proxy_workers.values()
-                  if worker.get_security_status())
+        return self._security_count
 
     def get_total_count(self):
         """获取总代理数量"""
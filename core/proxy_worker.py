@@ -11,15 +11,54 @@ Description:
 
 import logging
 import threading
+import time
 
 from datetime import datetime
-from typing import Literal
+from typing import Callable, Literal, Optional
 
+from core import worker_pool
 from core.dns_resolver import DNSResolver
+from core.timer_wheel import schedule
 from managers import ManagerContext
 
 logger = logging.getLogger(__name__)
 
+# 代理服务器类和配置函数，servers 包依赖 core 包，只能在首次启动代理时导入
+_SOCKS5_CLS = None
+_HTTP_CLS = None
+_GET_SOCKS_CFG = None
+_GET_HTTP_CFG = None
+_import_lock = threading.Lock()
+
+# 计算运行时间的状态
+_UPTIME_STATUSES = frozenset(("running", "starting"))
+
+# 运行时间显示格式：秒 / 分钟 / 小时+分钟 / 天+小时+分钟
+_SEC_FMT = "{}秒"
+_MIN_FMT = "{}分钟"
+_HR_FMT = "{}小时{}分钟"
+_DAY_FMT = "{}天{}小时{}分钟"
+
+
+def _ensure_imports():
+    """首次调用时导入代理服务器类，之后直接返回"""
+    global _SOCKS5_CLS, _HTTP_CLS, _GET_SOCKS_CFG, _GET_HTTP_CFG
+    if _SOCKS5_CLS is not None:
+        return
+
+    with _import_lock:
+        if _SOCKS5_CLS is not None:
+            return
+        from servers.socks5_proxy_server import SOCKS5ProxyServer
+        from servers.http_proxy_server import HTTPProxyServer
+        from utils import get_sock5_config, get_http_config
+        _HTTP_CLS = HTTPProxyServer
+        _GET_SOCKS_CFG = get_sock5_config
+        _GET_HTTP_CFG = get_http_config
+        # 最后赋值，其它线程看到它不为None时其余项均已就绪
+        _SOCKS5_CLS = SOCKS5ProxyServer
+
+
 
 class ProxyWorker:
     """代理工作器类，管理单个代理实例"""
@@ -27,7 +66,8 @@ class ProxyWorker:
     def __init__(self, config_id, proxy_interface, bind_interface,
                  dns_resolver: DNSResolver,
                  context: ManagerContext,
-                 kind: Literal['socks5', 'http'] = 'socks5'):
+                 kind: Literal['socks5', 'http'] = 'socks5',
+                 state_listener: Optional[Callable[[str, object, object], None]] = None):
         self.config_id = config_id
         self.interface = proxy_interface
         self.proxy_name = getattr(proxy_interface, 'proxy_name', f"Proxy-{config_id}")
@@ -36,18 +76,60 @@ class ProxyWorker:
         self.context = context
         self.kind = kind
 
+        # 按类型选定创建和运行代理服务器的方法，运行时不再逐处判断类型
+        if kind == 'socks5':
+            self._create_server = self._create_socks5_server
+            self._serve = self._serve_socks5
+        else:
+            self._create_server = self._create_http_server
+            self._serve = self._serve_http
+
+        # 日志中使用的 "接口名 IP:端口"，接口地址在工作器生命周期内不变，只格式化一次
+        self.address_label = f"{proxy_interface.iface_name} {proxy_interface.ip}:{proxy_interface.port}"
+
+        # 状态变化回调 (属性名, 旧值, 新值)，status 可能在代理线程中改变，回调需线程安全
+        self.state_listener = state_listener
+        self._state_lock = threading.Lock()
+
         # 从接口配置获取认证状态
         self.auth_enabled = getattr(proxy_interface, 'auth_enabled', True)
         self.security_enabled = getattr(proxy_interface, 'security_enabled', False)
 
-        # 运行状态
-        self.thread = None
-        self.status = "stopped"
+        # 运行状态，_future 为提交到共享线程池的启动任务
+        self._future = None
+        self._status = "stopped"
         self.proxy_server = None
+        # 重启时保留的代理服务器实例，下次启动直接复用
+        self._reusable_server = None
 
         self._base_socks5_server = None
 
         self.start_time = None
+        self._start_monotonic = 0.0
+
+        # get_info 中不随运行状态变化的字段，接口地址在工作器生命周期内不变
+        self._info_template = {
+            'config_id': config_id,
+            'interface_name': getattr(proxy_interface, 'proxy_name', 'Unknown'),
+            'address': f"{proxy_interface.ip}:{proxy_interface.port}",
+        }
+
+    @property
+    def status(self):
+        """运行状态：stopped / starting / running / error"""
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        with self._state_lock:
+            old, self._status = self._status, value
+            if old != value:
+                self._notify_state('status', old, value)
+
+    def _notify_state(self, name, old, new):
+        """通知状态变化"""
+        if self.state_listener:
+            self.state_listener(name, old, new)
 
     def get_auth_status(self):
         """获取认证状态"""
@@ -55,7 +137,9 @@ class ProxyWorker:
 
     def toggle_auth(self):
         """切换接口认证状态"""
-        self.auth_enabled = not self.auth_enabled
+        with self._state_lock:
+            self.auth_enabled = not self.auth_enabled
+            self._notify_state('auth_enabled', not self.auth_enabled, self.auth_enabled)
         # 更新接口对象的属性
         self.interface.auth_enabled = self.auth_enabled
         return self.auth_enabled
@@ -66,33 +150,30 @@ class ProxyWorker:
 
     def toggle_security(self):
         """切换安全管理状态"""
-        self.security_enabled = not self.security_enabled
+        with self._state_lock:
+            self.security_enabled = not self.security_enabled
+            self._notify_state('security_enabled', not self.security_enabled, self.security_enabled)
         # 更新接口对象的属性
         self.interface.security_enabled = self.security_enabled
         return self.security_enabled
 
     def start(self):
         """启动代理"""
-        if self.thread and self.thread.is_alive():
+        if self._status == "running" or (self._future is not None and not self._future.done()):
             return
 
         self.status = "starting"
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
 
-        self.thread = threading.Thread(
-            target=self._run_proxy,
-            daemon=True
-        )
-        self.thread.start()
+        self._future = worker_pool.submit(self._run_proxy)
 
     def stop(self):
         """停止代理"""
+        self._reusable_server = None
         try:
-            if self.proxy_server and self.kind == 'socks5':
+            if self.proxy_server is not None:
                 self.proxy_server.stop()
-            elif self.proxy_server and self.kind == 'http':
-                self.proxy_server.stop()
-
         except Exception as e:
             logger.error(f"停止代理 {self.config_id}: {self.interface.proxy_name}时出错: {e}")
 
@@ -101,60 +182,30 @@ class ProxyWorker:
 
     def restart(self):
         """重启代理"""
-        self.stop()
+        wipe = getattr(self.proxy_server, 'wipe', None)
+        if wipe is None or self.status != "running":
+            self.stop()
+        else:
+            # 支持 wipe() 的服务器（SOCKS5）保留监听socket，按最新接口配置重置后在下次启动时复用
+            try:
+                wipe(**_GET_SOCKS_CFG(self.interface))
+                self._reusable_server = self.proxy_server
+            except Exception as e:
+                logger.error(f"重置代理 {self.config_id}: {self.interface.proxy_name}时出错: {e}")
+                self.stop()
+            self.status = "stopped"
         # 延迟1秒后启动
-        threading.Timer(1.0, self.start).start()
+        schedule(1.0, self.start)
 
     def _run_proxy(self):
         """运行代理的实际方法"""
-        from servers.socks5_proxy_server import SOCKS5ProxyServer
-        from servers.http_proxy_server import HTTPProxyServer
+        _ensure_imports()
+        detached = False
         try:
             logger.debug(f"[{self.config_id}: {self.interface.proxy_name}] 启动代理服务器...")
 
-            if self.kind == 'socks5':
-
-                # 导入 SOCKS5 代理服务器
-                from utils import get_sock5_config
-                sock5_kwargs = get_sock5_config(self.interface)
-
-                self.proxy_server = SOCKS5ProxyServer(
-                    name = self.proxy_name,
-                    listen_host = self.interface.ip,
-                    listen_port = self.interface.port,
-                    egress_ip = self.bind_interface.ip,
-                    egress_port = self.bind_interface.port,
-
-                    dns_resolver = self.dns_resolver,
-
-                    user_manager = self.context.user_manager,
-                    security_manager = self.context.security_manager,
-                    ip_geo_manager=self.context.ip_geo_manager,
-                    stats_manager=self.context.stats_manager,
-
-                    **sock5_kwargs
-                )
-
-            elif self.kind == 'http':
-
-                from utils import get_http_config
-                http_kwargs = get_http_config(self.interface)
-
-                self.proxy_server = HTTPProxyServer(
-                    name = self.proxy_name,
-                    listen_host = self.interface.ip,
-                    listen_port = self.interface.port,
-                    egress_ip = self.bind_interface.ip,
-                    egress_port = self.bind_interface.port,
-
-                    dns_resolver = self.dns_resolver,
-
-                    user_manager = self.context.user_manager,
-                    security_manager = self.context.security_manager,
-                    ip_geo_manager=self.context.ip_geo_manager,
-                    stats_manager=self.context.stats_manager,
-                    **http_kwargs
-                )
+            server, self._reusable_server = self._reusable_server, None
+            self.proxy_server = server if server is not None else self._create_server()
 
             # 记录启动信息
             auth_status = "启用认证" if self.auth_enabled else "无认证"
@@ -162,14 +213,8 @@ class ProxyWorker:
 
             self.status = "running"
 
-            """启动并等待代理服务器"""
-            if self.proxy_server and self.kind == 'socks5':
-                self.proxy_server.start()  # 阻塞
-            elif self.proxy_server and self.kind == 'http':
-                if not self.proxy_server.start():
-                    raise Exception("HTTP代理启动失败")
-                if hasattr(self.proxy_server, 'thread'):
-                    self.proxy_server.thread.join()  # 用于http服务器等待线程结束
+            # 启动代理服务器，服务器交由反应器或自身线程运行后立即返回，退出时经 _on_server_exit 更新状态
+            detached = self._serve(self.proxy_server)
         except TimeoutError as e:
             logger.error(f"基服务器启动超时: {e}")
             try:
@@ -183,40 +228,89 @@ class ProxyWorker:
             self.status = "error"
 
         finally:
-            if self.status == "running":
-                self.status = "stopped"
-                logger.debug(f"[{self.config_id}: {self.interface.proxy_name}] 代理服务器已停止")
+            if not detached:
+                self._on_server_exit()
+
+    def _on_server_exit(self):
+        """代理服务器自行退出时更新状态"""
+        if self.status == "running":
+            self.status = "stopped"
+            logger.debug(f"[{self.config_id}: {self.interface.proxy_name}] 代理服务器已停止")
+
+    def _create_socks5_server(self):
+        """创建SOCKS5代理服务器"""
+        sock5_kwargs = _GET_SOCKS_CFG(self.interface)
+
+        return _SOCKS5_CLS(
+            name = self.proxy_name,
+            listen_host = self.interface.ip,
+            listen_port = self.interface.port,
+            egress_ip = self.bind_interface.ip,
+            egress_port = self.bind_interface.port,
+
+            dns_resolver = self.dns_resolver,
+
+            user_manager = self.context.user_manager,
+            security_manager = self.context.security_manager,
+            ip_geo_manager=self.context.ip_geo_manager,
+            stats_manager=self.context.stats_manager,
+
+            zero_copy=True,
+
+            **sock5_kwargs
+        )
+
+    def _create_http_server(self):
+        """创建HTTP代理服务器"""
+        http_kwargs = _GET_HTTP_CFG(self.interface)
+
+        return _HTTP_CLS(
+            name = self.proxy_name,
+            listen_host = self.interface.ip,
+            listen_port = self.interface.port,
+            egress_ip = self.bind_interface.ip,
+            egress_port = self.bind_interface.port,
+
+            dns_resolver = self.dns_resolver,
+
+            user_manager = self.context.user_manager,
+            security_manager = self.context.security_manager,
+            ip_geo_manager=self.context.ip_geo_manager,
+            stats_manager=self.context.stats_manager,
+            **http_kwargs
+        )
+
+    def _serve_socks5(self, proxy_server):
+        """启动SOCKS5代理服务器，由共享的监听反应器接受连接"""
+        return proxy_server.start_in_reactor(on_exit=self._on_server_exit)
+
+    def _serve_http(self, proxy_server):
+        """启动HTTP代理服务器，服务线程退出时更新状态"""
+        proxy_server.on_exit = self._on_server_exit
+        if not proxy_server.start():
+            raise Exception("HTTP代理启动失败")
+        return True
 
     def get_uptime(self):
         """获取运行时间"""
-        if not self.start_time or self.status not in ["running", "starting"]:
+        if not self.start_time or self._status not in _UPTIME_STATUSES:
             return None
 
-        uptime = datetime.now() - self.start_time
-        total_seconds = int(uptime.total_seconds())
+        total_seconds = int(time.monotonic() - self._start_monotonic)
 
         if total_seconds < 60:
-            return f"{total_seconds}秒"
-        elif total_seconds < 3600:
-            minutes = total_seconds // 60
-            return f"{minutes}分钟"
-        elif total_seconds < 86400:
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            return f"{hours}小时{minutes}分钟"
-        else:
-            days = total_seconds // 86400
-            hours = (total_seconds % 86400) // 3600
-            minutes = (total_seconds % 3600) // 60
-            return f"{days}天{hours}小时{minutes}分钟"
+            return _SEC_FMT.format(total_seconds)
+        minutes = total_seconds // 60 % 60
+        if total_seconds < 3600:
+            return _MIN_FMT.format(total_seconds // 60)
+        if total_seconds < 86400:
+            return _HR_FMT.format(total_seconds // 3600, minutes)
+        return _DAY_FMT.format(total_seconds // 86400, total_seconds // 3600 % 24, minutes)
 
     def get_info(self):
         """获取代理信息"""
-        return {
-            'config_id': self.config_id,
-            'interface_name': getattr(self.interface, 'proxy_name', 'Unknown'),
-            'address': f"{self.interface.ip}:{self.interface.port}",
-            'status': self.status,
-            'auth_enabled': self.auth_enabled,
-            'uptime': self.get_uptime(),
-        }
+        info = self._info_template.copy()
+        info['status'] = self.status
+        info['auth_enabled'] = self.auth_enabled
+        info['uptime'] = self.get_uptime()
+        return info
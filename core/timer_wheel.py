@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Module: timer_wheel.py
+Author: Takeshi
+Date: 2026-10-17
+
+Description:
+    进程内共享的延时任务调度器
+    所有延时任务由同一个后台线程按到期时间依次执行，避免每个延时任务各创建一个线程
+"""
+
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 待执行任务的小顶堆：(到期时刻, 序号, 回调)，序号保证同一时刻的任务按提交顺序执行
+_tasks: List[Tuple[float, int, Callable[[], None]]] = []
+_counter = itertools.count()
+_condition = threading.Condition()
+_thread: Optional[threading.Thread] = None
+
+
+def schedule(delay: float, fn: Callable[[], None]):
+    """
+    在 delay 秒后于调度线程中执行 fn
+
+    回调应尽快返回，耗时操作需自行另起线程，否则会推迟后续任务
+    """
+    global _thread
+
+    deadline = time.monotonic() + delay
+    with _condition:
+        entry = (deadline, next(_counter), fn)
+        heapq.heappush(_tasks, entry)
+
+        if _thread is None:
+            _thread = threading.Thread(target=_run, name="TimerWheel", daemon=True)
+            _thread.start()
+
+        # 新任务成为最早到期的任务时唤醒调度线程重新计算等待时间
+        if _tasks[0] is entry:
+            _condition.notify()
+
+
+def _run():
+    """调度线程：等待最早到期的任务并执行"""
+    while True:
+        with _condition:
+            while True:
+                now = time.monotonic()
+                if _tasks and _tasks[0][0] <= now:
+                    _, _, fn = heapq.heappop(_tasks)
+                    break
+                _condition.wait(_tasks[0][0] - now if _tasks else None)
+
+        try:
+            fn()
+        except Exception as e:
+            logger.error(f"延时任务执行异常: {e}")
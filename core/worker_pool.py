@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Module: worker_pool.py
+Author: Takeshi
+Date: 2026-10-17
+
+Description:
+    进程内共享的代理启动线程池和监听反应器
+    代理启动任务提交到有上限的线程池执行，启动完成后线程即归还
+    SOCKS5监听socket统一注册到同一个反应器线程，由一个selector等待所有监听socket的新连接，
+    避免每个代理各占一个线程阻塞在 accept 上
+"""
+
+
+import logging
+import os
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 启动线程数上限，线程按需创建，代理数较少时不会创建满
+_MAX_WORKERS = (os.cpu_count() or 1) * 2
+
+_executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="ProxyWorker")
+
+# 监听反应器：selector 及其唤醒socket对，首次注册监听socket时创建
+_selector: Optional[selectors.BaseSelector] = None
+_wakeup_r: Optional[socket.socket] = None
+_wakeup_w: Optional[socket.socket] = None
+_reactor_lock = threading.Lock()
+_reactor_thread: Optional[threading.Thread] = None
+
+# select 出错且找不到已关闭的socket时，重试前等待的秒数
+_ERROR_BACKOFF = 0.5
+
+
+def submit(fn: Callable[[], None]) -> Future:
+    """在共享线程池中执行 fn，返回对应的 Future"""
+    return _executor.submit(fn)
+
+
+def register_listener(sock: socket.socket, on_ready: Callable[[], None]):
+    """
+    将监听socket注册到反应器，有新连接可接受时在反应器线程中调用 on_ready
+
+    sock 会被设为非阻塞；on_ready 应尽快返回，耗时的连接处理需另起线程
+    """
+    global _selector, _wakeup_r, _wakeup_w, _reactor_thread
+
+    sock.setblocking(False)
+    with _reactor_lock:
+        if _reactor_thread is None:
+            _selector = selectors.DefaultSelector()
+            _wakeup_r, _wakeup_w = socket.socketpair()
+            _wakeup_r.setblocking(False)
+            _selector.register(_wakeup_r, selectors.EVENT_READ, None)
+            _reactor_thread = threading.Thread(target=_run_reactor, name="ListenerReactor", daemon=True)
+            _reactor_thread.start()
+
+        _selector.register(sock, selectors.EVENT_READ, on_ready)
+    _wakeup()
+
+
+def unregister_listener(sock: socket.socket):
+    """从反应器移除监听socket，需在关闭socket之前调用"""
+    with _reactor_lock:
+        if _selector is None:
+            return
+        try:
+            _selector.unregister(sock)
+        except (KeyError, ValueError):
+            return
+    _wakeup()
+
+
+def _wakeup():
+    """唤醒反应器线程，使其按最新的注册表重新等待"""
+    try:
+        _wakeup_w.send(b'\0')
+    except OSError:
+        pass
+
+
+def _drop_closed_listeners() -> int:
+    """移除注册表中已关闭的监听socket，返回移除的数量"""
+    dropped = 0
+    with _reactor_lock:
+        for key in list(_selector.get_map().values()):
+            try:
+                closed = key.fileobj.fileno() == -1
+            except (OSError, ValueError):
+                closed = True
+            if closed:
+                _selector.unregister(key.fileobj)
+                dropped += 1
+    if dropped:
+        logger.debug(f"监听反应器移除了 {dropped} 个已关闭的监听socket")
+    return dropped
+
+
+def _run_reactor():
+    """反应器线程：等待监听socket可读并分发给对应的回调"""
+    while True:
+        try:
+            events = _selector.select()
+        except OSError as e:
+            # 注册表中残留已关闭的socket时 select 会整体报错：移除它们后重试，否则稍后再试，避免空转
+            if not _drop_closed_listeners():
+                logger.warning(f"监听反应器等待出错，{_ERROR_BACKOFF}秒后重试: {e}")
+                time.sleep(_ERROR_BACKOFF)
+            continue
+
+        for key, _ in events:
+            on_ready = key.data
+            if on_ready is None:
+                try:
+                    while _wakeup_r.recv(512):
+                        pass
+                except OSError:
+                    pass
+                continue
+
+            try:
+                on_ready()
+            except Exception as e:
+                logger.error(f"监听回调执行异常: {e}")
@@ -44,8 +44,13 @@ class DNSConfig:
             实际TTL以DNS服务器返回的值为准，此为兜底值
             默认: 300秒（5分钟）
 
+        refresh_ratio (float): 缓存预刷新比例
+            命中的缓存记录已存活超过 TTL 的该比例时，在后台提前重新解析并刷新TTL
+            取值 0~1 之间，0 或 >=1 表示不预刷新
+            默认: 0.8
+
         cleanup_interval (Optional[int]): 缓存清理间隔（秒）
-            后台线程清理过期缓存的间隔时间
+            后台线程在记录到期时清理过期缓存，两次清理至少间隔该时间
             None: 不启用定期清理
             默认: 600秒（10分钟）
 
@@ -120,6 +125,7 @@ class DNSConfig:
     ])
     enable_cache: bool = True
     default_cache_ttl: int = 300
+    refresh_ratio: float = 0.8
     cleanup_interval: Optional[int] = 600
     max_cache_size: int = 1000
     enable_system_dns: bool = False
@@ -145,6 +151,7 @@ class DNSConfig:
             'dns_servers': self.dns_servers.copy(),  # 复制列表
             'enable_cache': self.enable_cache,
             'default_cache_ttl': self.default_cache_ttl,
+            'refresh_ratio': self.refresh_ratio,
             'cleanup_interval': self.cleanup_interval,
             'max_cache_size': self.max_cache_size,
             'enable_system_dns': self.enable_system_dns,
@@ -175,6 +182,7 @@ class DNSConfig:
             dns_servers=data.get('dns_servers', []),
             enable_cache=data.get('enable_cache', True),
             default_cache_ttl=data.get('default_cache_ttl', 300),
+            refresh_ratio=data.get('refresh_ratio', 0.8),
             cleanup_interval=data.get('cleanup_interval'),
             max_cache_size=data.get('max_cache_size', 1000),
             enable_system_dns=data.get('enable_system_dns', False),
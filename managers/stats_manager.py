@@ -129,6 +129,28 @@ class ConnectionRecord:
 
 
 
+class _TrafficCounter:
+    """单个连接的累计流量
+
+    同一连接的流量只由转发该连接的线程写入，计数只增不减，写入时无需加锁；
+    汇总时在锁内读取，与上次汇总时的值相减得到增量
+    """
+
+    __slots__ = ('sent', 'received', 'flushed_sent', 'flushed_received',
+                 'protocol', 'country', 'proxy_name', 'ip', 'user')
+
+    def __init__(self, protocol: str, country: str, proxy_name: str, ip: str, user: str):
+        self.sent = 0
+        self.received = 0
+        self.flushed_sent = 0
+        self.flushed_received = 0
+        self.protocol = protocol
+        self.country = country
+        self.proxy_name = proxy_name
+        self.ip = ip
+        self.user = user
+
+
 class StatsManager:
     """统计管理器"""
 
@@ -146,6 +168,9 @@ class StatsManager:
         self.active_traffic: Dict[str, Dict[str, int]] = {}
         self.recent_connections: List[ConnectionRecord] = []
 
+        # 各连接尚未汇总的流量计数，由监控线程或读取统计时汇总到下面的各项统计中
+        self._traffic_counters: Dict[str, _TrafficCounter] = {}
+
         # 实时统计
         self.total_traffic = {
             'bytes_sent': 0,
@@ -313,94 +338,128 @@ class StatsManager:
     def record_traffic(self, bytes_sent: int, bytes_received: int,
                       protocol: str = "", country: str = "", proxy_name: str = "",
                       ip: str = "", user: str = "", connection_id: str = ""):
-        """记录流量（实时调用）"""
+        """记录流量（实时调用）
+
+        只累加到该连接的计数中，不获取全局锁；同一连接的流量需由同一线程记录
+        """
         if not self.config.enable_stats or not connection_id:
             return
 
-        with self._lock:
-            # 更新总流量
-            self.total_traffic['bytes_sent'] += bytes_sent
-            self.total_traffic['bytes_received'] += bytes_received
-
-            # 更新活跃连接流量
-            traffic_data = self.active_traffic.get(connection_id)
-            if traffic_data is None:
-                # 如果连接不在活跃列表中，创建记录（可能先收到流量后开始连接）
-                traffic_data = {'sent': 0, 'received': 0}
-                self.active_traffic[connection_id] = traffic_data
-
-            traffic_data['sent'] += bytes_sent
-            traffic_data['received'] += bytes_received
-
-            # 更新连接的速度信息
-            record = self.active_connections.get(connection_id)
-            if record:
-                record.bytes_sent = traffic_data['sent']
-                record.bytes_received = traffic_data['received']
-                if self.enable_real_time_speed:
-                    record.update_speed(traffic_data['sent'], traffic_data['received'])
+        counter = self._traffic_counters.get(connection_id)
+        if counter is None:
+            with self._lock:
+                counter = self._traffic_counters.get(connection_id)
+                if counter is None:
+                    counter = _TrafficCounter(protocol, country, proxy_name, ip, user)
+                    self._traffic_counters[connection_id] = counter
+
+        counter.sent += bytes_sent
+        counter.received += bytes_received
+
+    def _flush_traffic(self):
+        """把各连接新增的流量汇总到统计中（调用方需持有锁）"""
+        for connection_id, counter in list(self._traffic_counters.items()):
+            self._flush_counter(connection_id, counter)
+
+    def _flush_counter(self, connection_id: str, counter: _TrafficCounter):
+        """汇总单个连接新增的流量（调用方需持有锁）"""
+        bytes_sent = counter.sent - counter.flushed_sent
+        bytes_received = counter.received - counter.flushed_received
+        if not bytes_sent and not bytes_received:
+            return
 
-            # 更新每日统计
-            today = self.current_day
-            if today in self.daily_stats:
-                stats = self.daily_stats[today]
+        counter.flushed_sent += bytes_sent
+        counter.flushed_received += bytes_received
+        self._apply_traffic(bytes_sent, bytes_received, counter.protocol, counter.country,
+                            counter.proxy_name, counter.ip, counter.user, connection_id)
+
+    def _apply_traffic(self, bytes_sent: int, bytes_received: int,
+                       protocol: str, country: str, proxy_name: str,
+                       ip: str, user: str, connection_id: str):
+        """把一段流量计入各项统计（调用方需持有锁）"""
+        # 更新总流量
+        self.total_traffic['bytes_sent'] += bytes_sent
+        self.total_traffic['bytes_received'] += bytes_received
+
+        # 更新活跃连接流量
+        traffic_data = self.active_traffic.get(connection_id)
+        if traffic_data is None:
+            # 如果连接不在活跃列表中，创建记录（可能先收到流量后开始连接）
+            traffic_data = {'sent': 0, 'received': 0}
+            self.active_traffic[connection_id] = traffic_data
+
+        traffic_data['sent'] += bytes_sent
+        traffic_data['received'] += bytes_received
+
+        # 更新连接的速度信息
+        record = self.active_connections.get(connection_id)
+        if record:
+            record.bytes_sent = traffic_data['sent']
+            record.bytes_received = traffic_data['received']
+            if self.enable_real_time_speed:
+                record.update_speed(traffic_data['sent'], traffic_data['received'])
 
-                # 更新总流量
-                stats.total_bytes_sent += bytes_sent
-                stats.total_bytes_received += bytes_received
+        # 更新每日统计
+        today = self.current_day
+        if today in self.daily_stats:
+            stats = self.daily_stats[today]
 
-                # 更新组合统计
-                proxy_name_display = proxy_name or "未命名代理"
-                user_display = user or "无认证"
-                protocol_display = protocol or "未知协议"
-                country_display = country or "未知"
+            # 更新总流量
+            stats.total_bytes_sent += bytes_sent
+            stats.total_bytes_received += bytes_received
 
-                combined_key = self._create_combined_key(
-                    proxy_name_display, ip, user_display, protocol_display, country_display
-                )
+            # 更新组合统计
+            proxy_name_display = proxy_name or "未命名代理"
+            user_display = user or "无认证"
+            protocol_display = protocol or "未知协议"
+            country_display = country or "未知"
 
-                if combined_key in stats.combined_stats:
-                    stats.combined_stats[combined_key]['bytes_sent'] += bytes_sent
-                    stats.combined_stats[combined_key]['bytes_received'] += bytes_received
-                    stats.combined_stats[combined_key]['last_active'] = time.time()
+            combined_key = self._create_combined_key(
+                proxy_name_display, ip, user_display, protocol_display, country_display
+            )
 
-                # 更新时间分布流量
-                hour_key = datetime.now().strftime("%H")
-                if hour_key in stats.hourly_traffic:
-                    stats.hourly_traffic[hour_key]["sent"] += bytes_sent
-                    stats.hourly_traffic[hour_key]["received"] += bytes_received
+            if combined_key in stats.combined_stats:
+                stats.combined_stats[combined_key]['bytes_sent'] += bytes_sent
+                stats.combined_stats[combined_key]['bytes_received'] += bytes_received
+                stats.combined_stats[combined_key]['last_active'] = time.time()
 
-                # 按维度更新流量
-                if country_display:
-                    stats.country_bytes_sent[country_display] = stats.country_bytes_sent.get(country_display, 0) + bytes_sent
-                    stats.country_bytes_received[country_display] = stats.country_bytes_received.get(country_display, 0) + bytes_received
+            # 更新时间分布流量
+            hour_key = datetime.now().strftime("%H")
+            if hour_key in stats.hourly_traffic:
+                stats.hourly_traffic[hour_key]["sent"] += bytes_sent
+                stats.hourly_traffic[hour_key]["received"] += bytes_received
 
-                if proxy_name_display:
-                    stats.proxy_bytes_sent[proxy_name_display] = stats.proxy_bytes_sent.get(proxy_name_display, 0) + bytes_sent
-                    stats.proxy_bytes_received[proxy_name_display] = stats.proxy_bytes_received.get(proxy_name_display, 0) + bytes_received
+            # 按维度更新流量
+            if country_display:
+                stats.country_bytes_sent[country_display] = stats.country_bytes_sent.get(country_display, 0) + bytes_sent
+                stats.country_bytes_received[country_display] = stats.country_bytes_received.get(country_display, 0) + bytes_received
 
-                stats.ip_bytes_sent[ip] = stats.ip_bytes_sent.get(ip, 0) + bytes_sent
-                stats.ip_bytes_received[ip] = stats.ip_bytes_received.get(ip, 0) + bytes_received
+            if proxy_name_display:
+                stats.proxy_bytes_sent[proxy_name_display] = stats.proxy_bytes_sent.get(proxy_name_display, 0) + bytes_sent
+                stats.proxy_bytes_received[proxy_name_display] = stats.proxy_bytes_received.get(proxy_name_display, 0) + bytes_received
 
-                if user_display:
-                    stats.user_bytes_sent[user_display] = stats.user_bytes_sent.get(user_display, 0) + bytes_sent
-                    stats.user_bytes_received[user_display] = stats.user_bytes_received.get(user_display, 0) + bytes_received
+            stats.ip_bytes_sent[ip] = stats.ip_bytes_sent.get(ip, 0) + bytes_sent
+            stats.ip_bytes_received[ip] = stats.ip_bytes_received.get(ip, 0) + bytes_received
 
-            # 更新分类统计流量
-            if protocol:
-                self.protocol_stats[protocol]['sent'] += bytes_sent
-                self.protocol_stats[protocol]['received'] += bytes_received
-            if country:
-                self.country_stats[country]['sent'] += bytes_sent
-                self.country_stats[country]['received'] += bytes_received
-            if proxy_name:
-                self.proxy_stats[proxy_name]['sent'] += bytes_sent
-                self.proxy_stats[proxy_name]['received'] += bytes_received
-            self.ip_stats[ip]['sent'] += bytes_sent
-            self.ip_stats[ip]['received'] += bytes_received
-            if user:
-                self.user_stats[user]['sent'] += bytes_sent
-                self.user_stats[user]['received'] += bytes_received
+            if user_display:
+                stats.user_bytes_sent[user_display] = stats.user_bytes_sent.get(user_display, 0) + bytes_sent
+                stats.user_bytes_received[user_display] = stats.user_bytes_received.get(user_display, 0) + bytes_received
+
+        # 更新分类统计流量
+        if protocol:
+            self.protocol_stats[protocol]['sent'] += bytes_sent
+            self.protocol_stats[protocol]['received'] += bytes_received
+        if country:
+            self.country_stats[country]['sent'] += bytes_sent
+            self.country_stats[country]['received'] += bytes_received
+        if proxy_name:
+            self.proxy_stats[proxy_name]['sent'] += bytes_sent
+            self.proxy_stats[proxy_name]['received'] += bytes_received
+        self.ip_stats[ip]['sent'] += bytes_sent
+        self.ip_stats[ip]['received'] += bytes_received
+        if user:
+            self.user_stats[user]['sent'] += bytes_sent
+            self.user_stats[user]['received'] += bytes_received
 
     def record_connection_end(self, connection_id: str,
                             bytes_sent: int = 0,
@@ -411,6 +470,11 @@ class StatsManager:
             return
 
         with self._lock:
+            # 先汇总该连接剩余的流量
+            counter = self._traffic_counters.pop(connection_id, None)
+            if counter:
+                self._flush_counter(connection_id, counter)
+
             record = self.active_connections.pop(connection_id, None)
             if not record:
                 return
@@ -445,6 +509,7 @@ class StatsManager:
     def get_realtime_stats(self) -> Dict[str, Any]:
         """获取实时统计"""
         with self._lock:
+            self._flush_traffic()
             now = time.time()
 
             # 计算实时速度
@@ -504,6 +569,7 @@ class StatsManager:
         details: List[Dict[str, Any]] = []
 
         with self._lock:
+            self._flush_traffic()
             current_time = time.time()
 
             for conn_id, record in self.active_connections.items():
@@ -545,6 +611,7 @@ class StatsManager:
     def get_detailed_stats(self, date: str = None) -> Dict[str, Any]:
         """获取详细统计数据"""
         with self._lock:
+            self._flush_traffic()
             if date is None:
                 date = self.current_day
 
@@ -579,6 +646,7 @@ class StatsManager:
             }
 
             with self._lock:
+                self._flush_traffic()
                 current = start
                 while current <= end:
                     date_str = current.strftime("%Y-%m-%d")
@@ -666,6 +734,7 @@ class StatsManager:
     def _update_monitor(self):
         """更新监控数据"""
         with self._lock:
+            self._flush_traffic()
             now = time.time()
             self._last_update_time = now
 
@@ -724,6 +793,7 @@ class StatsManager:
             }
 
             with self._lock:
+                self._flush_traffic()
                 for date, stats in self.daily_stats.items():
                     try:
                         data['daily_stats'][date] = asdict(stats)
@@ -747,6 +817,7 @@ class StatsManager:
             self.daily_stats.clear()
             self.active_connections.clear()
             self.active_traffic.clear()
+            self._traffic_counters.clear()
             self.recent_connections.clear()
 
             self.total_traffic = {
@@ -19,10 +19,10 @@ import socketserver
 import ssl
 import threading
 import time
-from typing import Optional, Literal, Dict
+from typing import Callable, Optional, Literal, Dict
 from urllib.parse import urlparse
 
-from utils import ProxyProtocolReceiver
+from utils import BufferPool, ProxyProtocolReceiver, get_buffer_pool
 from core import  DNSResolver
 
 from managers import IPGeoManager, SecurityManager, StatsManager, UserManager
@@ -30,6 +30,7 @@ from managers import IPGeoManager, SecurityManager, StatsManager, UserManager
 
 logger = logging.getLogger(__name__)
 
+
 class HTTPProxyServer:
     """
     一个支持HTTP/HTTPS协议的代理服务器，直接连接到目标网站（绑定指定网卡）。
@@ -64,6 +65,7 @@ class HTTPProxyServer:
                  stats_enabled: bool = True,
                  stats_manager: Optional[StatsManager] = None,
 
+                 buffer_pool: Optional[BufferPool] = None,
                  ):
         # 代理名称
         self.name = name
@@ -101,6 +103,9 @@ class HTTPProxyServer:
         self.stats_enabled = stats_enabled
         self.stats_manager = stats_manager
 
+        # 隧道转发使用的缓冲区池，默认使用进程共享的池
+        self.buffer_pool = buffer_pool or get_buffer_pool()
+
         # 运行参数
         self.mode = "https" if self.use_https else "http"
         self.server = None
@@ -108,6 +113,9 @@ class HTTPProxyServer:
         self.running = False
         self._stop_event = threading.Event()
 
+        # 服务线程退出时的回调，由使用方在 start() 前设置
+        self.on_exit: Optional[Callable[[], None]] = None
+
         # UDP唤醒socket，用于中断连接等待循环
         self._wakeup_socket = None
         self._force_stop = False
@@ -148,6 +156,7 @@ class HTTPProxyServer:
                 dns_resolver=self.dns_resolver,
                 stats_enabled=self.stats_enabled,
                 stats_manager=self.stats_manager,
+                buffer_pool=self.buffer_pool,
                 auth_enabled=self.auth_enabled,
                 user_manager=self.user_manager,
                 security_enabled=self.security_enabled,
@@ -269,6 +278,8 @@ class HTTPProxyServer:
         finally:
             self.running = False
             logger.debug(f"{self.name}: {self.mode} 代理服务器线程退出")
+            if self.on_exit:
+                self.on_exit()
 
     def _create_wakeup_socket(self) -> None:
         """创建用于唤醒服务器的socket"""
@@ -423,6 +434,7 @@ class HTTPProxyHandler(http.server.BaseHTTPRequestHandler):
                 dns_resolver: Optional[DNSResolver] = None,
                 stats_enabled: bool = True,
                 stats_manager: Optional[StatsManager] = None,
+                buffer_pool: Optional[BufferPool] = None,
                 auth_enabled: bool = False,
                 user_manager=None,
                 security_enabled=False,
@@ -437,6 +449,7 @@ class HTTPProxyHandler(http.server.BaseHTTPRequestHandler):
 
         self.stats_enabled = stats_enabled
         self.stats_manager = stats_manager
+        self.buffer_pool = buffer_pool or get_buffer_pool()
 
         self.auth_enabled = auth_enabled
         self.user_manager = user_manager
@@ -1261,6 +1274,9 @@ class HTTPProxyHandler(http.server.BaseHTTPRequestHandler):
 
     def relay_data_with_stats(self, client_conn, target_sock):
         """在客户端和目标服务器之间双向转发数据，包含流量统计"""
+        # 整个隧道复用同一块缓冲区，recv_into 直接写入，不再为每次读取分配 bytes
+        buffer = self.buffer_pool.acquire()
+        view = memoryview(buffer)
         try:
             logger.debug(f"{self.name}: 开始数据转发...")
             while True:
@@ -1270,18 +1286,18 @@ class HTTPProxyHandler(http.server.BaseHTTPRequestHandler):
 
                 for sock in rlist:
                     try:
-                        data = sock.recv(4096)
-                        if not data:
+                        n = sock.recv_into(view)
+                        if not n:
                             logger.debug(f"{self.name}: 连接关闭，停止数据转发")
                             return  # 连接关闭
 
                         if sock is client_conn:
                             # 从客户端接收，发往目标服务器
-                            target_sock.sendall(data)
+                            target_sock.sendall(view[:n])
 
                             # 统计接收的流量
                             if self.stats_enabled and self.stats_manager:
-                                received_from_client_once = len(data)
+                                received_from_client_once = n
                                 self.total_received_from_client += received_from_client_once
                                 self.stats_manager.record_traffic(
                                     bytes_sent=0,
@@ -1295,11 +1311,11 @@ class HTTPProxyHandler(http.server.BaseHTTPRequestHandler):
                                 )
                         else:
                             # 从目标服务器接收，发往客户端
-                            client_conn.sendall(data)
+                            client_conn.sendall(view[:n])
 
                             # 统计发送的流量
                             if self.stats_enabled and self.stats_manager:
-                                sent_to_client_once = len(data)
+                                sent_to_client_once = n
                                 self.total_sent_to_client += sent_to_client_once
                                 self.stats_manager.record_traffic(
                                     bytes_sent=sent_to_client_once,
@@ -1322,6 +1338,8 @@ class HTTPProxyHandler(http.server.BaseHTTPRequestHandler):
         except Exception as e:
             logger.debug(f"{self.name}: 客户端和目标服务器数据转发异常: {e}")
         finally:
+            view.release()
+            self.buffer_pool.release(buffer)
             if target_sock:
                 try:
                     target_sock.close()
@@ -9,21 +9,31 @@ Description:
 """
 
 import logging
+import os
 import select
 import socket
 import struct
+import sys
 import threading
-from typing import Optional, Tuple, Literal
+from typing import Callable, Optional, Tuple, Literal
 
-from utils import ProxyProtocolReceiver
+from utils import BufferPool, ProxyProtocolReceiver, get_buffer_pool
 
 from core import DNSResolver
+from core.worker_pool import register_listener, unregister_listener
 
 from managers import IPGeoManager, SecurityManager, StatsManager, UserManager
 
 
 logger = logging.getLogger(__name__)
 
+# 双向转发时单次读取的最大字节数；批量读写可减少每字节的 select/recv/send 系统调用次数
+_RELAY_BUFFER_SIZE = 64 * 1024
+
+# Linux下可用 splice 经管道在内核中转发数据（Python 3.10+）
+_SPLICE_AVAILABLE = sys.platform == "linux" and hasattr(os, "splice")
+
+
 class SOCKS5ProxyServer:
     def __init__(self,
                  name: str,
@@ -49,6 +59,10 @@ class SOCKS5ProxyServer:
                  stats_manager: Optional[StatsManager] = None,
 
                  health_check_mode: bool = False,
+
+                 zero_copy: bool = False,
+
+                 buffer_pool: Optional[BufferPool] = None,
                 ):
         """
         SOCKS5代理服务器初始化
@@ -105,10 +119,19 @@ class SOCKS5ProxyServer:
             logger.debug(f"{self.name}: Socks5启用健康模式，关闭流量统计")
 
 
+        # 是否使用零拷贝转发（仅Linux支持，其它平台使用普通的recv/send转发）
+        self.zero_copy = zero_copy and _SPLICE_AVAILABLE
+
+        # 普通转发使用的缓冲区池，默认使用进程共享的池
+        self.buffer_pool = buffer_pool or get_buffer_pool()
+
         # 运行参数
         self.running = False
         self.server_socket: Optional[socket.socket] = None
 
+        # 由监听反应器驱动时为 True；on_exit 在监听异常退出时调用
+        self._in_reactor = False
+        self._on_exit: Optional[Callable[[], None]] = None
 
     def handle_client(self, client_socket: socket.socket, client_addr: Tuple[str, int]):
         """处理客户端连接"""
@@ -536,9 +559,16 @@ class SOCKS5ProxyServer:
         """在两个 socket 之间双向转发数据，返回 (发送字节数, 接收字节数)"""
         logger.debug(f"{self.name}: forward_data开始数据转发...")
 
+        if self.zero_copy:
+            return self._forward_data_splice(source, destination, connection_id)
+
         total_sent_to_client = 0      # 发送到客户端的流量
         total_received_from_client = 0  # 从客户端接收的流量
 
+        # 整个连接复用同一块缓冲区，recv_into 直接写入，不再为每次读取分配 bytes
+        buffer = self.buffer_pool.acquire()
+        view = memoryview(buffer)
+
         try:
             while True:
                 rlist, _, _ = select.select([source, destination], [], [], 60)
@@ -549,9 +579,9 @@ class SOCKS5ProxyServer:
 
                 for sock in rlist:
                     try:
-                        data = sock.recv(4096)
+                        n = sock.recv_into(view)
 
-                        if not data:
+                        if not n:
                             logger.debug(f"{self.name}: forward_data转发过程中接收到EOF，连接被对端关闭。")
                             return total_sent_to_client, total_received_from_client
 
@@ -559,10 +589,10 @@ class SOCKS5ProxyServer:
                             # 从客户端接收，发往目标服务器
 
                             try:
-                                destination.sendall(data)
+                                destination.sendall(view[:n])
 
                                 # 记录从客户端接收的流量
-                                received_from_client_once = len(data)
+                                received_from_client_once = n
                                 total_received_from_client += received_from_client_once  # 从客户端接收的流量
 
                                 if self.stats_enabled and self.stats_manager:
@@ -585,9 +615,9 @@ class SOCKS5ProxyServer:
                         else:
                             try:
                                 # 从目标服务器接收，发往客户端
-                                source.sendall(data)
+                                source.sendall(view[:n])
 
-                                sent_to_client_once = len(data)
+                                sent_to_client_once = n
                                 total_sent_to_client += sent_to_client_once  # 发送给客户端的流量
 
                                 # 记录发送到客户端的流量
@@ -616,6 +646,9 @@ class SOCKS5ProxyServer:
             logger.error(f"{self.name}: 数据转发过程中发生未处理错误: {e}")
             raise
         finally:
+            view.release()
+            self.buffer_pool.release(buffer)
+
             # 确保sockets关闭
             for sock in [source, destination]:
                 if sock:
@@ -626,20 +659,93 @@ class SOCKS5ProxyServer:
 
         return total_sent_to_client, total_received_from_client
 
-    def start(self):
-        """启动SOCKS5代理服务器"""
-        if self.running:
-            logger.warning(f"{self.name}: SOCKS5代理服务器已经在运行")
-            return True
+    def _forward_data_splice(self, source: socket.socket, destination: socket.socket, connection_id: str) -> Tuple[int, int]:
+        """用 splice 经管道在内核中双向转发数据，数据不复制到用户空间，返回 (发送字节数, 接收字节数)"""
+        total_sent_to_client = 0
+        total_received_from_client = 0
+        pipe_r, pipe_w = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        try:
+            while True:
+                rlist, _, _ = select.select([source, destination], [], [], 60)
+
+                if not rlist:
+                    logger.debug(f"{self.name}: forward_data转发过程超时 (60s), 关闭连接。")
+                    break
+
+                for sock in rlist:
+                    peer = destination if sock is source else source
+                    try:
+                        count = os.splice(sock.fileno(), pipe_w, _RELAY_BUFFER_SIZE,
+                                          flags=os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK)
+                        if not count:
+                            logger.debug(f"{self.name}: forward_data转发过程中接收到EOF，连接被对端关闭。")
+                            return total_sent_to_client, total_received_from_client
+                        self._drain_pipe(pipe_r, peer, count)
+                    except BlockingIOError:
+                        continue
+                    except OSError as e:
+                        logger.debug(f"{self.name}: forward_data转发过程中socket错误: {e}")
+                        return total_sent_to_client, total_received_from_client
+
+                    if sock is source:
+                        total_received_from_client += count
+                        self._record_traffic(0, count, connection_id)
+                    else:
+                        total_sent_to_client += count
+                        self._record_traffic(count, 0, connection_id)
+
+        except Exception as e:
+            logger.error(f"{self.name}: 数据转发过程中发生未处理错误: {e}")
+            raise
+        finally:
+            for fd in (pipe_r, pipe_w):
+                os.close(fd)
+            for sock in [source, destination]:
+                try:
+                    sock.close()
+                except (OSError, socket.error):
+                    pass
+
+        return total_sent_to_client, total_received_from_client
 
+    @staticmethod
+    def _drain_pipe(pipe_r: int, destination: socket.socket, count: int):
+        """把管道中的 count 字节全部 splice 到目标socket，发送缓冲区满时等待可写"""
+        while count > 0:
+            try:
+                count -= os.splice(pipe_r, destination.fileno(), count, flags=os.SPLICE_F_MOVE)
+            except BlockingIOError:
+                _, wlist, _ = select.select([], [destination], [], 60)
+                if not wlist:
+                    raise TimeoutError("等待目标socket可写超时 (60s)")
+
+    def _record_traffic(self, bytes_sent: int, bytes_received: int, connection_id: str):
+        """记录一次转发的流量"""
+        if self.stats_enabled and self.stats_manager:
+            self.stats_manager.record_traffic(
+                bytes_sent=bytes_sent,
+                bytes_received=bytes_received,
+                protocol='socks5',
+                country=self.location_info,
+                proxy_name=self.name,
+                ip=self.client_ip,
+                user=self.current_user,
+                connection_id=connection_id,
+            )
+
+    def _open_listener(self) -> bool:
+        """创建并绑定监听socket"""
         if self.egress_ip is None or self.egress_port is None:
             logger.error(f"{self.name}: SOCKS5服务器必须提供出口地址和端口 ")
             return False
 
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server_socket.bind((self.listen_host, self.listen_port))
-        self.server_socket.listen(100)
+        # wipe() 后保留的监听socket直接复用，不再重新创建和绑定
+        if self.server_socket is None or self.server_socket.fileno() == -1:
+            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server_socket.bind((self.listen_host, self.listen_port))
+            self.server_socket.listen(100)
 
         self.running = True
         status = "有认证 " if self.auth_enabled else "无认证 "
@@ -647,17 +753,32 @@ class SOCKS5ProxyServer:
         status += "有连接统计 " if self.stats_enabled else "无连接统计 "
         status += f"有proxy_protocol: {self.proxy_protocol}" if self.proxy_protocol else "无proxy_protocol"
         logger.info(f"{self.name}: SOCKS5代理服务器启动，监听地址： {self.listen_host}:{self.listen_port}, 网络出口： {self.egress_ip}:{self.egress_port}，功能状态：{status}")
+        return True
+
+    def _spawn_handler(self, client_socket: socket.socket, client_addr: Tuple[str, int]):
+        """为新连接创建处理线程"""
+        thread = threading.Thread(
+            target=self.handle_client,
+            args=(client_socket, client_addr),
+            daemon=True
+        )
+        thread.start()
+
+    def start(self):
+        """启动SOCKS5代理服务器，阻塞直到服务器停止"""
+        if self.running:
+            logger.warning(f"{self.name}: SOCKS5代理服务器已经在运行")
+            return True
+
+        if not self._open_listener():
+            return False
+        self.server_socket.setblocking(True)
 
         try:
             while self.running:
                 try:
                     client_socket, client_addr = self.server_socket.accept()
-                    thread = threading.Thread(
-                        target=self.handle_client,
-                        args=(client_socket, client_addr),
-                        daemon=True
-                    )
-                    thread.start()
+                    self._spawn_handler(client_socket, client_addr)
                 except socket.timeout:
                     continue
                 except OSError as e:
@@ -670,12 +791,80 @@ class SOCKS5ProxyServer:
             logger.error(f"{self.name}: SOCKS5代理服务器运行出错，正在关闭...: {e}")
             self.stop()
 
+    def start_in_reactor(self, on_exit: Optional[Callable[[], None]] = None) -> bool:
+        """
+        启动SOCKS5代理服务器并交由共享的监听反应器接受连接，立即返回
+
+        监听出错导致服务器停止时调用 on_exit
+        """
+        if self.running:
+            logger.warning(f"{self.name}: SOCKS5代理服务器已经在运行")
+            return True
+
+        if not self._open_listener():
+            return False
+
+        self._on_exit = on_exit
+        self._in_reactor = True
+        register_listener(self.server_socket, self._on_accept_ready)
+        return True
+
+    def _on_accept_ready(self):
+        """监听socket可读时由反应器调用，接受当前所有待处理的连接"""
+        while self.running:
+            try:
+                client_socket, client_addr = self.server_socket.accept()
+            except BlockingIOError:
+                return
+            except OSError as e:
+                if self.running:
+                    logger.error(f"{self.name}: 监听过程中等待客户端连接时发生错误: {e}")
+                    self.stop()
+                    if self._on_exit:
+                        self._on_exit()
+                return
+
+            # 监听socket为非阻塞，连接socket需恢复为阻塞模式供处理线程使用
+            client_socket.setblocking(True)
+            self._spawn_handler(client_socket, client_addr)
+
+    def wipe(self,
+             auth_enabled: bool = False,
+             security_enabled: bool = False,
+             proxy_protocol: Optional[Literal['v1', 'v2']] = None,
+             ):
+        """
+        停止接受连接并更新认证、安全和proxy_protocol配置，供重启时复用本实例
+
+        监听socket保持打开，下次 start_in_reactor() 时直接复用；已建立的连接不受影响
+        """
+        logger.info(f"{self.name}: SOCKS5代理服务器暂停接受连接，等待重新启动")
+        self.running = False
+
+        if self._in_reactor:
+            self._in_reactor = False
+            unregister_listener(self.server_socket)
+        self._on_exit = None
+
+        self.current_user = ""
+        self.client_ip = ""
+        self.location_info = ""
+
+        # 健康检查模式下这些功能始终关闭
+        if not self.health_check_mode:
+            self.auth_enabled = auth_enabled
+            self.security_enabled = security_enabled
+            self.proxy_protocol = proxy_protocol
+
     def stop(self):
         """停止代理服务器"""
         logger.info(f"{self.name}: SOCKS5代理服务器正在停止...")
         self.running = False
 
         if self.server_socket:
+            if self._in_reactor:
+                self._in_reactor = False
+                unregister_listener(self.server_socket)
             try:
                 self.server_socket.close()
             except:
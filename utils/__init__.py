@@ -4,6 +4,7 @@
 
 from .interface_utils import NetworkInterface, generate_all_interfaces, unique_interfaces, get_sock5_config, get_http_config
 from .proxy_protocol import ProxyProtocolReceiver, ProxyProtocolGenerator
+from .buffer_pool import BufferPool, get_buffer_pool
 
 
 
@@ -15,4 +16,6 @@ __all__ = [
     'get_http_config',
     'ProxyProtocolReceiver',
     'ProxyProtocolGenerator',
+    'BufferPool',
+    'get_buffer_pool',
 ]
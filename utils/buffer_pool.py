@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Module: buffer_pool.py
+Author: Takeshi
+Date: 2026-10-17
+
+Description:
+    进程内共享的转发缓冲区池
+    每个连接转发时从池中取出一块固定大小的缓冲区，配合 recv_into 重复使用，
+    连接结束后归还，避免每次 recv 都分配新的 bytes 对象
+"""
+
+
+from collections import deque
+from typing import Optional
+
+# 单块缓冲区大小，与代理服务器单次转发读取的最大字节数一致
+RELAY_BUFFER_SIZE = 64 * 1024
+
+# 池中最多保留的空闲缓冲区数量，超出部分直接交给垃圾回收
+_MAX_IDLE_BUFFERS = 64
+
+
+class BufferPool:
+    """固定大小缓冲区池，deque 的 append/pop 为原子操作，多线程取还无需加锁"""
+
+    def __init__(self, buffer_size: int = RELAY_BUFFER_SIZE, max_idle: int = _MAX_IDLE_BUFFERS):
+        self.buffer_size = buffer_size
+        self.max_idle = max_idle
+        self._idle = deque()
+
+    def acquire(self) -> bytearray:
+        """取出一块缓冲区，池空时新分配"""
+        try:
+            return self._idle.pop()
+        except IndexError:
+            return bytearray(self.buffer_size)
+
+    def release(self, buffer: bytearray):
+        """归还缓冲区"""
+        if len(self._idle) < self.max_idle:
+            self._idle.append(buffer)
+
+
+_buffer_pool: Optional[BufferPool] = None
+
+
+def get_buffer_pool() -> BufferPool:
+    """获取转发缓冲区池单例"""
+    global _buffer_pool
+    if _buffer_pool is None:
+        _buffer_pool = BufferPool()
+    return _buffer_pool
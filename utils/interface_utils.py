@@ -4,7 +4,8 @@
 """
 
 import sys
-from typing import List, Dict, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional
 import psutil
 
 # 根据操作系统选择实现
@@ -18,6 +19,9 @@ else:
     # 回退到基础实现
     from .platforms.network_interface import BaseNetworkInterface as NetworkInterface
 
+# 并发生成接口实例的最大线程数
+_MAX_INTERFACE_WORKERS = 32
+
 def get_outbound_interfaces():
     """
     获取真实网卡列表（流量出口）
@@ -151,17 +155,31 @@ def get_listening_interfaces():
 
     return listening_interfaces
 
+def _build_interface(cfg: Dict) -> Optional[NetworkInterface]:
+    """根据单个配置生成 NetworkInterface 实例，配置无效时返回None"""
+    try:
+        return NetworkInterface(**cfg)
+    except (ValueError, NotImplementedError):
+        return None
+
 def generate_all_interfaces(config_list: List[Dict]) -> Tuple[List[NetworkInterface], List[Dict]]:
-    """根据配置列表生成 NetworkInterface 实例列表"""
+    """根据配置列表生成 NetworkInterface 实例列表
+
+    按名称查找IP需要调用系统命令或读取注册表，各配置互不相关，多个配置时并发生成，结果保持原顺序。
+    """
     valid_interfaces = []
     invalid_configs = []
 
-    for cfg in config_list:
-        try:
-            iface = NetworkInterface(**cfg)
-            valid_interfaces.append(iface)
+    if len(config_list) > 1:
+        with ThreadPoolExecutor(max_workers=min(_MAX_INTERFACE_WORKERS, len(config_list))) as pool:
+            results = list(pool.map(_build_interface, config_list))
+    else:
+        results = [_build_interface(cfg) for cfg in config_list]
 
-        except (ValueError, NotImplementedError) as e:
+    for cfg, iface in zip(config_list, results):
+        if iface is not None:
+            valid_interfaces.append(iface)
+        else:
             invalid_configs.append(cfg)
 
     return valid_interfaces, invalid_configs